@@ -237,17 +237,24 @@ THEMES: dict[str, EditorTheme] = {
 class SettingsManager:
     """Manages application settings including themes."""
 
+    # Theme name shared by all instances — widgets look the theme up on every
+    # restyle, and it only changes through set_current_theme()
+    _theme_name: str | None = None
+
     def __init__(self):
         self.settings = QSettings("MyNotion", "Editor")
 
     def get_current_theme_name(self) -> str:
         """Get the name of the current theme."""
-        return self.settings.value("theme", "Dark (Default)")
+        if SettingsManager._theme_name is None:
+            SettingsManager._theme_name = self.settings.value("theme", "Dark (Default)")
+        return SettingsManager._theme_name
 
     def set_current_theme(self, theme_name: str):
         """Set the current theme by name."""
         if theme_name in THEMES:
             self.settings.setValue("theme", theme_name)
+            SettingsManager._theme_name = theme_name
 
     def get_current_theme(self) -> EditorTheme:
         """Get the current theme object."""
@@ -284,6 +291,15 @@ class SettingsManager:
         size = max(8, min(72, int(size)))
         self.settings.setValue("font_size", size)
 
+    # Tab switching
+    def get_tab_fade_enabled(self) -> bool:
+        """Get whether switching tabs fades the editor in."""
+        return self.settings.value("tab_fade_enabled", False, type=bool)
+
+    def set_tab_fade_enabled(self, enabled: bool):
+        """Set whether switching tabs fades the editor in."""
+        self.settings.setValue("tab_fade_enabled", enabled)
+
     # Side panel settings
     def get_side_panel_visible(self) -> bool:
         """Get side panel visibility state."""
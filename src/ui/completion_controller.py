@@ -73,6 +73,9 @@ class CompletionController(QObject):
         editor.set_completion_enabled(enabled)
         if enabled:
             editor.set_completion_delay(self._settings.get_completion_delay())
+        # new_tab and the tab switch both wire the editor; keep one connection
+        with contextlib.suppress(TypeError):
+            editor.completion_requested.disconnect(self._on_editor_requested)
         editor.completion_requested.connect(self._on_editor_requested)
 
     def disconnect_editor(self, editor: EditorTab) -> None:
@@ -122,7 +125,9 @@ class CompletionController(QObject):
         hover_border = "" if theme.is_beveled else f" border: 1px solid {hex_to_rgba(fg, 0.3)};"
         if enabled:
             self._btn.setText("\u25c9 AI")
-            self._btn.setToolTip(self._window.tr(f"AI Code Completion: ON \u2014 {model}"))
+            self._btn.setToolTip(
+                self._window.tr("AI Code Completion: ON \u2014 %1").replace("%1", model)
+            )
             self._btn.setStyleSheet(
                 f"QToolButton {{ background: {theme.chrome_hover};"
                 f" color: {theme.keyword}; font-size: 11px;"
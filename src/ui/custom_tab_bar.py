@@ -67,6 +67,7 @@ class CustomTabBar(QTabBar):
 
     tab_close_requested = pyqtSignal(int)
     new_tab_requested = pyqtSignal()
+    tabs_changed = pyqtSignal()  # A tab was inserted or removed
 
     def __init__(self, parent=None):
         super().__init__(parent)
@@ -82,11 +83,13 @@ class CustomTabBar(QTabBar):
         self.setTabButton(index, QTabBar.ButtonPosition.RightSide, close_btn)
 
         self._update_close_buttons()
+        self.tabs_changed.emit()
 
     def tabRemoved(self, index: int):
         """Update after tab is removed."""
         super().tabRemoved(index)
         self._update_close_buttons()
+        self.tabs_changed.emit()
 
     def _update_close_buttons(self):
         """Update close button connections after tab changes."""
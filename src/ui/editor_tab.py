@@ -2,11 +2,23 @@
 Editor tab widget - handles individual document editing.
 """
 
+import contextlib
+import functools
 import logging
 import os
-
-from PyQt6.QtCore import QRect, QSize, Qt, QTimer, pyqtSignal
-from PyQt6.QtGui import QColor, QFont, QFontDatabase, QPainter, QTextFormat
+import shutil
+import tempfile
+
+from PyQt6.QtCore import QEvent, QPoint, QRect, QSize, Qt, QTimer, pyqtSignal
+from PyQt6.QtGui import (
+    QColor,
+    QFont,
+    QFontDatabase,
+    QPainter,
+    QPixmap,
+    QTextCursor,
+    QTextFormat,
+)
 from PyQt6.QtWidgets import QPlainTextEdit, QTextEdit, QWidget
 
 from core.settings import EditorTheme, SettingsManager
@@ -21,6 +33,29 @@ logger = logging.getLogger(__name__)
 # File size thresholds (bytes)
 _LARGE_FILE_THRESHOLD = 1_000_000  # 1 MB — disable syntax highlighting
 _MAX_FILE_SIZE = 50_000_000  # 50 MB — refuse to open
+_READ_CHUNK_SIZE = 65_536  # Characters per insert when streaming a file into the document
+
+# Line separator written on save — matches what text-mode open() used to produce
+_LINE_SEPARATOR = os.linesep.encode("ascii")
+
+# Substitutions toPlainText() makes inside a block, applied per block on save
+_PLAIN_TEXT_TABLE = str.maketrans({"\u2028": os.linesep, "\u00a0": " "})
+
+
+def _current_umask() -> int:
+    """Read the process umask (os.umask can only be read by setting it)."""
+    mask = os.umask(0)
+    os.umask(mask)
+    return mask
+
+
+@functools.lru_cache(maxsize=1)
+def _default_fixed_font() -> QFont:
+    """System fixed-pitch font, looked up once per process.
+
+    Callers must copy it (``QFont(_default_fixed_font())``) before changing it.
+    """
+    return QFontDatabase.systemFont(QFontDatabase.SystemFont.FixedFont)
 
 
 class LineNumberArea(QWidget):
@@ -71,9 +106,19 @@ class EditorTab(QPlainTextEdit):
 
         # Ghost text (inline completion suggestions)
         self._ghost_text: str = ""
+        self._ghost_lines: list[str] = []
         self._ghost_text_line: int = -1
         self._ghost_text_col: int = -1
+        # Cached ghost geometry — recomputed on set_ghost_text / font change, not per paint
+        self._ghost_x_offset: int = 0
+        self._ghost_line_height: int = 0
+        self._font_ascent: int = 0
+        self._digit_advance: int = 0
+        self._space_advance: int = 0
+        self._update_font_metrics()
         self._completion_enabled = False
+        # (document revision, cursor position) of the last completion request
+        self._last_completion_key: tuple[int, int] | None = None
 
         # Debounce timer for triggering completion requests
         self._completion_timer = QTimer(self)
@@ -81,6 +126,12 @@ class EditorTab(QPlainTextEdit):
         self._completion_timer.setInterval(600)
         self._completion_timer.timeout.connect(self._request_completion)
 
+        # Coalesces ghost text repaints into one per event-loop pass
+        self._ghost_repaint_timer = QTimer(self)
+        self._ghost_repaint_timer.setSingleShot(True)
+        self._ghost_repaint_timer.setInterval(0)
+        self._ghost_repaint_timer.timeout.connect(lambda: self.viewport().update())
+
         # Inline AI edit state
         self._inline_edit_bar = None  # Lazy-created InlineEditBar
         self._has_edit_highlights = False
@@ -107,7 +158,8 @@ class EditorTab(QPlainTextEdit):
             # Use two-argument constructor to set size immediately
             font = QFont(font_family, font_size)
         else:
-            font = QFontDatabase.systemFont(QFontDatabase.SystemFont.FixedFont)
+            font = QFont(_default_fixed_font())
+            font.setPointSize(font_size)
 
         # Always explicitly set point size after creation to ensure it's valid
         if font.pointSize() <= 0:
@@ -118,9 +170,6 @@ class EditorTab(QPlainTextEdit):
         # Also set font on the document to prevent Qt internal -1 point size issues
         self.document().setDefaultFont(font)
 
-        # Tab settings (4 spaces)
-        self.setTabStopDistance(self.fontMetrics().horizontalAdvance(" ") * 4)
-
         # Line wrapping off for code
         self.setLineWrapMode(QPlainTextEdit.LineWrapMode.NoWrap)
 
@@ -132,6 +181,11 @@ class EditorTab(QPlainTextEdit):
 
     def _apply_theme_style(self):
         """Apply the current theme colors to the editor."""
+        # Gutter colors parsed once per theme instead of on every paint
+        self._qc_ln_bg = QColor(self._theme.line_number_bg)
+        self._qc_ln_fg = QColor(self._theme.line_number_fg)
+        self._qc_border = QColor(self._theme.chrome_border)
+        self._ln_bg_strip: QPixmap | None = None  # Rebuilt lazily for the new colors
         self.setStyleSheet(f"""
             QPlainTextEdit {{
                 background-color: {self._theme.background};
@@ -159,13 +213,7 @@ class EditorTab(QPlainTextEdit):
 
     def line_number_area_width(self) -> int:
         """Calculate the width needed for line numbers."""
-        digits = 1
-        max_num = max(1, self.blockCount())
-        while max_num >= 10:
-            max_num //= 10
-            digits += 1
-        space = 3 + self.fontMetrics().horizontalAdvance("9") * digits + 10
-        return space
+        return 3 + self._digit_advance * len(str(self.blockCount() or 1)) + 10
 
     def _update_line_number_area_width(self, _):
         """Update viewport margins for line number area."""
@@ -191,37 +239,22 @@ class EditorTab(QPlainTextEdit):
     def line_number_area_paint_event(self, event):
         """Paint line numbers."""
         painter = QPainter(self.line_number_area)
-        painter.fillRect(event.rect(), QColor(self._theme.line_number_bg))
-
-        # Line color for separators
-        line_color = QColor(self._theme.chrome_border)
-
-        # Draw line on LEFT edge - separates panel from line numbers
-        painter.setPen(line_color)
-        painter.drawLine(
-            0,
-            event.rect().top(),
-            0,
-            event.rect().bottom(),
-        )
 
-        # Draw line on RIGHT edge - separates line numbers from code
-        painter.drawLine(
-            self.line_number_area.width() - 1,
-            event.rect().top(),
-            self.line_number_area.width() - 1,
-            event.rect().bottom(),
-        )
+        # Background and both edge separators come from one pre-rendered row
+        strip = self._line_number_strip()
+        rect = event.rect()
+        painter.drawTiledPixmap(rect, strip, QPoint(rect.x() % strip.width(), 0))
 
         block = self.firstVisibleBlock()
         block_number = block.blockNumber()
         top = int(self.blockBoundingGeometry(block).translated(self.contentOffset()).top())
         bottom = top + int(self.blockBoundingRect(block).height())
 
+        # Number color is the same for every line — set the pen once
+        painter.setPen(self._qc_ln_fg)
         while block.isValid() and top <= event.rect().bottom():
             if block.isVisible() and bottom >= event.rect().top():
                 number = str(block_number + 1)
-                painter.setPen(QColor(self._theme.line_number_fg))
                 painter.drawText(
                     0,
                     top,
@@ -236,6 +269,24 @@ class EditorTab(QPlainTextEdit):
             bottom = top + int(self.blockBoundingRect(block).height())
             block_number += 1
 
+    def _line_number_strip(self) -> QPixmap:
+        """Return a 1px-high row of the gutter: background plus both separators.
+
+        Rebuilt only when the gutter width or theme changes.
+        """
+        width = max(1, self.line_number_area.width())
+        if self._ln_bg_strip is None or self._ln_bg_strip.width() != width:
+            strip = QPixmap(width, 1)
+            strip.fill(self._qc_ln_bg)
+            painter = QPainter(strip)
+            painter.setPen(self._qc_border)
+            # LEFT edge separates panel from line numbers, RIGHT edge separates them from code
+            painter.drawPoint(0, 0)
+            painter.drawPoint(width - 1, 0)
+            painter.end()
+            self._ln_bg_strip = strip
+        return self._ln_bg_strip
+
     def _highlight_current_line(self):
         """Highlight the line where the cursor is.
 
@@ -263,12 +314,19 @@ class EditorTab(QPlainTextEdit):
     def _set_language(self, language: Language):
         """Set the syntax highlighting language."""
         self.language = language
+        # Detach the old highlighter — it is parented to the document and would keep running
+        self._detach_highlighter()
         # Create new highlighter with theme colors
         self._highlighter = create_highlighter(language, self.document(), self._theme)
 
+    def _detach_highlighter(self):
+        """Disconnect the current highlighter from the document, if any."""
+        if self._highlighter is not None:
+            self._highlighter.setDocument(None)
+            self._highlighter = None
+
     def apply_theme(self):
         """Reload and apply the current theme from settings."""
-        self._settings = SettingsManager()
         self._theme = self._settings.get_current_theme()
 
         # Update font
@@ -284,7 +342,11 @@ class EditorTab(QPlainTextEdit):
             font_size = 12
 
         # Use two-argument constructor to set size immediately
-        font = QFont(font_family, font_size) if font_family else QFont("Consolas", font_size)
+        if font_family:
+            font = QFont(font_family, font_size)
+        else:
+            font = QFont(_default_fixed_font())
+            font.setPointSize(font_size)
 
         # Always explicitly set point size after creation to ensure it's valid
         if font.pointSize() <= 0:
@@ -301,9 +363,6 @@ class EditorTab(QPlainTextEdit):
         elif self._zoom_level < 0:
             self.zoomOut(abs(self._zoom_level))
 
-        # Update tab stops
-        self.setTabStopDistance(self.fontMetrics().horizontalAdvance(" ") * 4)
-
         # Apply theme style
         self._apply_theme_style()
 
@@ -332,20 +391,15 @@ class EditorTab(QPlainTextEdit):
 
         # Detect language from extension
         language = get_language_from_extension(filepath)
-        if is_large:
-            # Disable syntax highlighting for large files
-            self._set_language(Language.PLAIN)
-            logger.info("Large file (%d bytes) — syntax highlighting disabled", file_size)
-        else:
-            self._set_language(language)
 
+        # No highlighter during the bulk insert — attaching one afterwards runs a
+        # single full pass instead of re-highlighting every inserted block
+        self._detach_highlighter()
         try:
-            with open(filepath, encoding="utf-8") as f:
-                self.setPlainText(f.read())
+            self._read_into_document(filepath, "utf-8")
         except UnicodeDecodeError:
             try:
-                with open(filepath) as f:
-                    self.setPlainText(f.read())
+                self._read_into_document(filepath, None)
             except (OSError, ValueError) as e:
                 return f"Cannot read file: {e}"
         except FileNotFoundError:
@@ -354,6 +408,13 @@ class EditorTab(QPlainTextEdit):
             return f"Permission denied: {filepath}"
         except OSError as e:
             return f"Cannot open file: {e}"
+        finally:
+            if is_large:
+                # Disable syntax highlighting for large files
+                self._set_language(Language.PLAIN)
+                logger.info("Large file (%d bytes) — syntax highlighting disabled", file_size)
+            else:
+                self._set_language(language)
 
         # Store the detected language even if highlighting is off
         self.language = language
@@ -362,6 +423,27 @@ class EditorTab(QPlainTextEdit):
         self.document().setModified(False)
         return None
 
+    def _read_into_document(self, filepath: str, encoding: str | None) -> None:
+        """Stream a file into the document in chunks instead of one giant string.
+
+        Undo and repaints are suspended during the bulk insert, so peak memory
+        stays near one copy of the text. Raises the same errors as open()/read().
+        """
+        doc = self.document()
+        with open(filepath, encoding=encoding) as f:
+            self.setUpdatesEnabled(False)
+            # Disabling undo also clears the stack, like setPlainText does
+            doc.setUndoRedoEnabled(False)
+            try:
+                doc.clear()
+                cursor = QTextCursor(doc)
+                for chunk in iter(lambda: f.read(_READ_CHUNK_SIZE), ""):
+                    cursor.insertText(chunk)
+            finally:
+                doc.setUndoRedoEnabled(True)
+                self.setUpdatesEnabled(True)
+        self.moveCursor(QTextCursor.MoveOperation.Start)
+
     def save_file(self, filepath: str | None = None) -> str | None:
         """Save content to a file.
 
@@ -375,8 +457,7 @@ class EditorTab(QPlainTextEdit):
 
         if self.filepath:
             try:
-                with open(self.filepath, "w", encoding="utf-8") as f:
-                    f.write(self.toPlainText())
+                self._write_document(self.filepath)
             except PermissionError:
                 return f"Permission denied: {self.filepath}"
             except OSError as e:
@@ -385,6 +466,56 @@ class EditorTab(QPlainTextEdit):
             self.document().setModified(False)
         return None
 
+    def _write_document(self, filepath: str) -> None:
+        """Write the document block by block to a temp file, then swap it into place.
+
+        Each block is encoded on its own, so the whole text is never held as
+        one Python str plus its UTF-8 bytes. os.replace() makes the save atomic:
+        a failed write leaves the original file untouched. Files with several
+        hard links are rewritten in place instead, which keeps the links.
+        """
+        # Replace the symlink's target, not the link itself
+        filepath = os.path.realpath(filepath)
+        try:
+            links = os.stat(filepath).st_nlink
+        except FileNotFoundError:
+            links = 0
+        if links > 1:
+            # A replace would split the file off its other hard links
+            with open(filepath, "wb") as f:
+                self._write_blocks(f)
+            return
+
+        directory = os.path.dirname(filepath)
+        with tempfile.NamedTemporaryFile("wb", dir=directory, delete=False) as tmp:
+            try:
+                self._write_blocks(tmp)
+            except BaseException:
+                tmp.close()
+                os.unlink(tmp.name)
+                raise
+
+        try:
+            if links:
+                shutil.copymode(filepath, tmp.name)
+            else:
+                # mkstemp creates 0600; give new files the usual umask default
+                os.chmod(tmp.name, 0o666 & ~_current_umask())
+            os.replace(tmp.name, filepath)
+        except BaseException:
+            with contextlib.suppress(OSError):
+                os.unlink(tmp.name)
+            raise
+
+    def _write_blocks(self, f) -> None:
+        """Write each block as UTF-8, joined by the platform line separator."""
+        block = self.document().begin()
+        while block.isValid():
+            f.write(block.text().translate(_PLAIN_TEXT_TABLE).encode("utf-8"))
+            block = block.next()
+            if block.isValid():
+                f.write(_LINE_SEPARATOR)
+
     def set_language(self, language: Language):
         """Manually set the syntax highlighting language."""
         self._set_language(language)
@@ -398,6 +529,27 @@ class EditorTab(QPlainTextEdit):
         if hasattr(self, "line_number_area"):
             self.line_number_area.setFont(font)
 
+    def changeEvent(self, event) -> None:
+        """Refresh cached font metrics when the font changes (setFont or zoom)."""
+        super().changeEvent(event)
+        # Font changes can arrive from super().__init__ before our attributes exist
+        if event.type() == QEvent.Type.FontChange and hasattr(self, "_ghost_text"):
+            self._update_font_metrics()
+            if self._ghost_text:
+                self._update_ghost_geometry()
+
+    def _update_font_metrics(self) -> None:
+        """Cache the font metrics used on paint paths and refresh tab stops."""
+        metrics = self.fontMetrics()
+        self._font_ascent = metrics.ascent()
+        self._digit_advance = metrics.horizontalAdvance("9")
+        self._space_advance = metrics.horizontalAdvance(" ")
+        # Ghost lines step by the font's line spacing; taken from the metrics,
+        # not the block layout, which has not been redone yet on FontChange
+        self._ghost_line_height = metrics.lineSpacing()
+        # Tab settings (4 spaces)
+        self.setTabStopDistance(self._space_advance * 4)
+
     def zoom_in(self):
         """Increase font size."""
         self._zoom_level += 1
@@ -419,6 +571,7 @@ class EditorTab(QPlainTextEdit):
         self._completion_enabled = enabled
         if not enabled:
             self._completion_timer.stop()
+            self._last_completion_key = None
             self.clear_ghost_text()
 
     def set_completion_delay(self, delay_ms: int) -> None:
@@ -432,17 +585,31 @@ class EditorTab(QPlainTextEdit):
             return
         cursor = self.textCursor()
         self._ghost_text = text
+        self._ghost_lines = text.split("\n")
         self._ghost_text_line = cursor.blockNumber()
         self._ghost_text_col = cursor.columnNumber()
-        self.viewport().update()
+        self._update_ghost_geometry()
+        self._ghost_repaint_timer.start()
+
+    def _update_ghost_geometry(self) -> None:
+        """Cache the x offset used to paint ghost text."""
+        block = self.document().findBlockByNumber(self._ghost_text_line)
+        if not block.isValid():
+            return
+        prefix_on_line = block.text()[: self._ghost_text_col]
+        self._ghost_x_offset = self.fontMetrics().horizontalAdvance(prefix_on_line) + int(
+            self.document().documentMargin()
+        )
 
     def clear_ghost_text(self) -> None:
         """Remove any visible ghost text."""
         if self._ghost_text:
             self._ghost_text = ""
+            self._ghost_lines = []
             self._ghost_text_line = -1
             self._ghost_text_col = -1
-            self.viewport().update()
+            self._ghost_x_offset = 0
+            self._ghost_repaint_timer.start()
 
     def has_ghost_text(self) -> bool:
         """Check if ghost text is currently displayed."""
@@ -455,7 +622,7 @@ class EditorTab(QPlainTextEdit):
 
         text_to_insert = self._ghost_text
         if first_line_only:
-            text_to_insert = self._ghost_text.split("\n")[0]
+            text_to_insert = self._ghost_lines[0]
 
         cursor = self.textCursor()
         cursor.insertText(text_to_insert)
@@ -467,16 +634,47 @@ class EditorTab(QPlainTextEdit):
         if not self._completion_enabled:
             return
 
-        from ai.completion import extract_context
-
         cursor = self.textCursor()
-        text = self.toPlainText()
-        prefix, suffix = extract_context(text, cursor.blockNumber(), cursor.columnNumber())
+        # Skip re-extracting context if nothing changed since the last request
+        key = (self.document().revision(), cursor.position())
+        if key == self._last_completion_key:
+            return
+        self._last_completion_key = key
+
+        prefix, suffix = self._local_context(cursor)
 
         # Only request if there's meaningful prefix content
         if prefix.strip():
             self.completion_requested.emit(prefix, suffix)
 
+    def _local_context(self, cursor: QTextCursor) -> tuple[str, str]:
+        """Collect prefix/suffix by walking neighbouring blocks from the cursor.
+
+        Same window as ai.completion.extract_context, but never copies the
+        whole document — cost depends on the context size, not the file size.
+        """
+        from ai.completion import PREFIX_MAX_LINES, SUFFIX_MAX_LINES
+
+        current = cursor.block()
+        line = current.text()
+        col = cursor.positionInBlock()
+
+        before: list[str] = []
+        block = current.previous()
+        while block.isValid() and len(before) < PREFIX_MAX_LINES:
+            before.append(block.text())
+            block = block.previous()
+        before.reverse()
+        before.append(line[:col])
+
+        after = [line[col:]]
+        block = current.next()
+        while block.isValid() and len(after) <= SUFFIX_MAX_LINES:
+            after.append(block.text())
+            block = block.next()
+
+        return "\n".join(before), "\n".join(after)
+
     def keyPressEvent(self, event) -> None:
         """Handle key presses for ghost text accept/dismiss and completion triggers."""
         # If the inline edit bar is visible, don't intercept keys here
@@ -526,27 +724,27 @@ class EditorTab(QPlainTextEdit):
         if not block.isValid():
             return
 
-        # Get block geometry in viewport coordinates
+        # Only the block top depends on scrolling; x offset and height are cached
         geom = self.blockBoundingGeometry(block).translated(self.contentOffset())
         block_top = int(geom.top())
-        line_height = int(self.blockBoundingRect(block).height())
-
-        # Calculate x position: after the ghost_text_col characters
-        block_text = block.text()
-        prefix_on_line = block_text[: self._ghost_text_col]
-        x_offset = self.fontMetrics().horizontalAdvance(prefix_on_line)
-
-        # Account for document margin
-        x_offset += int(self.document().documentMargin())
+        line_height = self._ghost_line_height
+        x_offset = self._ghost_x_offset
 
         painter = QPainter(self.viewport())
         ghost_color = QColor(180, 210, 190, 90)  # rgba(180,210,190,0.35)
         painter.setPen(ghost_color)
         painter.setFont(self.font())
 
-        ghost_lines = self._ghost_text.split("\n")
-        for i, line in enumerate(ghost_lines):
-            y = block_top + (i * line_height) + self.fontMetrics().ascent()
+        # Skip ghost lines outside the repainted region
+        top_clip = event.rect().top()
+        bottom_clip = event.rect().bottom()
+        for i, line in enumerate(self._ghost_lines):
+            line_top = block_top + (i * line_height)
+            if line_top + line_height < top_clip:
+                continue
+            if line_top > bottom_clip:
+                break
+            y = line_top + self._font_ascent
             if i == 0:
                 # First line: draw after cursor position
                 painter.drawText(x_offset, y, line)
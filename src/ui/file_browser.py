@@ -5,7 +5,7 @@ File browser panel - Tree view for browsing project files.
 import os
 from pathlib import Path
 
-from PyQt6.QtCore import QDir, QModelIndex, pyqtSignal
+from PyQt6.QtCore import QDir, QModelIndex, QSortFilterProxyModel, pyqtSignal
 from PyQt6.QtGui import QFileSystemModel
 from PyQt6.QtWidgets import (
     QFileDialog,
@@ -17,9 +17,152 @@ from PyQt6.QtWidgets import (
     QWidget,
 )
 
-from core.settings import SettingsManager
+from core.settings import EditorTheme, SettingsManager
 from ui.theme_engine import hex_to_rgba
 
+# Heavy directories hidden from the tree so expanding a large project never lists them
+_PRUNED_DIR_NAMES = frozenset(
+    {
+        ".git",
+        "node_modules",
+        "__pycache__",
+        ".venv",
+        "dist",
+        "build",
+        ".mypy_cache",
+        ".pytest_cache",
+    }
+)
+
+# Built stylesheets per theme name — themes are fixed, so each is built at most once
+_STYLESHEET_CACHE: dict[str, tuple[str, str, str, str]] = {}
+
+
+def _build_stylesheets(theme: EditorTheme) -> tuple[str, str, str, str]:
+    """Build the (panel, title, button, tree) stylesheets for a theme."""
+    bg = theme.background
+    fg = theme.foreground
+    text_main = hex_to_rgba(fg, 0.65)
+    text_dim = hex_to_rgba(fg, 0.5)
+    selection_bg = hex_to_rgba(fg, 0.15)
+    hover_bg = hex_to_rgba(fg, 0.08)
+
+    panel_qss = f"""
+        QWidget {{
+            background-color: {bg};
+            color: {text_main};
+            font-family: 'Consolas', 'SF Mono', monospace;
+        }}
+    """
+
+    title_qss = f"""
+        QLabel {{
+            color: {text_dim};
+            font-size: 10px;
+            font-weight: 600;
+            letter-spacing: 0.1em;
+            text-transform: uppercase;
+        }}
+    """
+
+    button_qss = f"""
+        QPushButton {{
+            background: transparent;
+            border: none;
+            font-size: 12px;
+        }}
+        QPushButton:hover {{
+            background: {hover_bg};
+            border-radius: {theme.radius};
+        }}
+    """
+
+    tree_qss = f"""
+        QTreeView {{
+            background-color: {bg};
+            color: {text_main};
+            border: none;
+            padding: 4px 8px;
+            font-size: 11px;
+        }}
+        QTreeView::item {{
+            padding: 4px 8px;
+            border-radius: {theme.radius};
+        }}
+        QTreeView::item:hover {{
+            background-color: {hover_bg};
+        }}
+        QTreeView::item:selected {{
+            background-color: {selection_bg};
+            color: {fg};
+        }}
+        QTreeView::branch {{
+            background-color: {bg};
+        }}
+        QTreeView::branch:has-siblings:!adjoins-item {{
+            border-image: none;
+        }}
+        QTreeView::branch:has-siblings:adjoins-item {{
+            border-image: none;
+        }}
+        QTreeView::branch:!has-children:!has-siblings:adjoins-item {{
+            border-image: none;
+        }}
+        QTreeView::branch:has-children:!has-siblings:closed,
+        QTreeView::branch:closed:has-children:has-siblings {{
+            image: none;
+            border-image: none;
+        }}
+        QTreeView::branch:open:has-children:!has-siblings,
+        QTreeView::branch:open:has-children:has-siblings {{
+            image: none;
+            border-image: none;
+        }}
+        QScrollBar:vertical {{
+            background: {bg};
+            width: 8px;
+            margin: 0;
+        }}
+        QScrollBar::handle:vertical {{
+            background: {hex_to_rgba(fg, 0.2)};
+            border-radius: {theme.radius};
+            min-height: 30px;
+        }}
+        QScrollBar::handle:vertical:hover {{
+            background: {hex_to_rgba(fg, 0.3)};
+        }}
+        QScrollBar::add-line:vertical,
+        QScrollBar::sub-line:vertical {{
+            height: 0;
+        }}
+        QScrollBar::add-page:vertical,
+        QScrollBar::sub-page:vertical {{
+            background: none;
+        }}
+    """
+    return panel_qss, title_qss, button_qss, tree_qss
+
+
+class PrunedFileProxyModel(QSortFilterProxyModel):
+    """Proxy over QFileSystemModel that hides heavy directories like .git or node_modules.
+
+    Hidden rows are never shown, so the source model never fetches their contents.
+    """
+
+    def filterAcceptsRow(self, source_row: int, source_parent: QModelIndex) -> bool:
+        model = self.sourceModel()
+        index = model.index(source_row, 0, source_parent)
+        if model.fileName(index) not in _PRUNED_DIR_NAMES or not model.isDir(index):
+            return True
+        # Never hide the project root itself or one of its ancestors
+        root = model.rootPath()
+        path = model.filePath(index)
+        return root == path or root.startswith(path.rstrip("/") + "/")
+
+    def refresh(self) -> None:
+        """Re-run the filter (the root-path exemption depends on the current root)."""
+        self.invalidateFilter()
+
 
 class FileBrowserPanel(QWidget):
     """File tree sidebar for browsing project files."""
@@ -28,6 +171,7 @@ class FileBrowserPanel(QWidget):
 
     def __init__(self, parent=None):
         super().__init__(parent)
+        self._settings = SettingsManager()
         self._setup_ui()
         self._apply_style()
 
@@ -70,7 +214,11 @@ class FileBrowserPanel(QWidget):
         filters = QDir.Filter.NoDotAndDotDot | QDir.Filter.AllDirs | QDir.Filter.Files
         self.model.setFilter(filters)
 
-        self.tree_view.setModel(self.model)
+        # Prune heavy directories at the model layer
+        self.proxy_model = PrunedFileProxyModel(self)
+        self.proxy_model.setSourceModel(self.model)
+
+        self.tree_view.setModel(self.proxy_model)
 
         # Hide size, type, date columns - show only name
         self.tree_view.setColumnHidden(1, True)
@@ -86,7 +234,8 @@ class FileBrowserPanel(QWidget):
         """Set the root directory for the file browser."""
         if Path(path).exists():
             root_index = self.model.setRootPath(path)
-            self.tree_view.setRootIndex(root_index)
+            self.proxy_model.refresh()
+            self.tree_view.setRootIndex(self.proxy_model.mapFromSource(root_index))
 
     def open_folder_dialog(self):
         """Open a folder picker to select project root."""
@@ -101,113 +250,24 @@ class FileBrowserPanel(QWidget):
 
     def _on_item_double_clicked(self, index: QModelIndex):
         """Handle double-click on a file item."""
+        if index.model() is self.proxy_model:
+            index = self.proxy_model.mapToSource(index)
         filepath = self.model.filePath(index)
         if Path(filepath).is_file():
             self.file_selected.emit(filepath)
 
     def _apply_style(self):
         """Apply current theme styling."""
-        theme = SettingsManager().get_current_theme()
-        bg = theme.background
-        fg = theme.foreground
-        text_main = hex_to_rgba(fg, 0.65)
-        text_dim = hex_to_rgba(fg, 0.5)
-        selection_bg = hex_to_rgba(fg, 0.15)
-        hover_bg = hex_to_rgba(fg, 0.08)
-
-        self.setStyleSheet(f"""
-            QWidget {{
-                background-color: {bg};
-                color: {text_main};
-                font-family: 'Consolas', 'SF Mono', monospace;
-            }}
-        """)
-
-        self.title_label.setStyleSheet(f"""
-            QLabel {{
-                color: {text_dim};
-                font-size: 10px;
-                font-weight: 600;
-                letter-spacing: 0.1em;
-                text-transform: uppercase;
-            }}
-        """)
-
-        self.open_folder_btn.setStyleSheet(f"""
-            QPushButton {{
-                background: transparent;
-                border: none;
-                font-size: 12px;
-            }}
-            QPushButton:hover {{
-                background: {hover_bg};
-                border-radius: {theme.radius};
-            }}
-        """)
-
-        self.tree_view.setStyleSheet(f"""
-            QTreeView {{
-                background-color: {bg};
-                color: {text_main};
-                border: none;
-                padding: 4px 8px;
-                font-size: 11px;
-            }}
-            QTreeView::item {{
-                padding: 4px 8px;
-                border-radius: {theme.radius};
-            }}
-            QTreeView::item:hover {{
-                background-color: {hover_bg};
-            }}
-            QTreeView::item:selected {{
-                background-color: {selection_bg};
-                color: {fg};
-            }}
-            QTreeView::branch {{
-                background-color: {bg};
-            }}
-            QTreeView::branch:has-siblings:!adjoins-item {{
-                border-image: none;
-            }}
-            QTreeView::branch:has-siblings:adjoins-item {{
-                border-image: none;
-            }}
-            QTreeView::branch:!has-children:!has-siblings:adjoins-item {{
-                border-image: none;
-            }}
-            QTreeView::branch:has-children:!has-siblings:closed,
-            QTreeView::branch:closed:has-children:has-siblings {{
-                image: none;
-                border-image: none;
-            }}
-            QTreeView::branch:open:has-children:!has-siblings,
-            QTreeView::branch:open:has-children:has-siblings {{
-                image: none;
-                border-image: none;
-            }}
-            QScrollBar:vertical {{
-                background: {bg};
-                width: 8px;
-                margin: 0;
-            }}
-            QScrollBar::handle:vertical {{
-                background: {hex_to_rgba(fg, 0.2)};
-                border-radius: {theme.radius};
-                min-height: 30px;
-            }}
-            QScrollBar::handle:vertical:hover {{
-                background: {hex_to_rgba(fg, 0.3)};
-            }}
-            QScrollBar::add-line:vertical,
-            QScrollBar::sub-line:vertical {{
-                height: 0;
-            }}
-            QScrollBar::add-page:vertical,
-            QScrollBar::sub-page:vertical {{
-                background: none;
-            }}
-        """)
+        theme = self._settings.get_current_theme()
+        stylesheets = _STYLESHEET_CACHE.get(theme.name)
+        if stylesheets is None:
+            stylesheets = _STYLESHEET_CACHE[theme.name] = _build_stylesheets(theme)
+        panel_qss, title_qss, button_qss, tree_qss = stylesheets
+
+        self.setStyleSheet(panel_qss)
+        self.title_label.setStyleSheet(title_qss)
+        self.open_folder_btn.setStyleSheet(button_qss)
+        self.tree_view.setStyleSheet(tree_qss)
 
     def apply_theme(self):
         """Public method for external theme updates."""
@@ -2,8 +2,11 @@
 Find and Replace bar widget.
 """
 
-from PyQt6.QtCore import Qt, pyqtSignal
-from PyQt6.QtGui import QKeySequence, QShortcut, QTextDocument
+import bisect
+import re
+
+from PyQt6.QtCore import QRegularExpression, QSignalBlocker, Qt, QTimer, pyqtSignal
+from PyQt6.QtGui import QKeySequence, QShortcut, QTextCursor, QTextDocument
 from PyQt6.QtWidgets import (
     QCheckBox,
     QHBoxLayout,
@@ -13,9 +16,115 @@ from PyQt6.QtWidgets import (
     QWidget,
 )
 
-from core.settings import SettingsManager
+from core.settings import EditorTheme, SettingsManager
 from ui.theme_engine import hex_to_rgba
 
+# Stop counting after this many matches so huge documents don't stall typing
+MATCH_COUNT_LIMIT = 1000
+
+# Case-sensitive Replace All rewrites the whole document in one insert once
+# there are at least this many matches per block; below that, per-match
+# inserts re-lay out fewer blocks than a full rewrite would
+_REWRITE_MATCHES_PER_BLOCK = 0.25
+
+# Characters outside the BMP — one str index but two QTextDocument positions
+_ASTRAL_CHAR = re.compile("[\U00010000-\U0010ffff]")
+
+# Built stylesheets per theme name — themes are fixed, so each is built at most once
+_STYLESHEET_CACHE: dict[str, str] = {}
+
+
+def _build_stylesheet(theme: EditorTheme) -> str:
+    """Build the find bar stylesheet for a theme."""
+    bg = theme.chrome_bg
+    text = theme.foreground
+    text_dim = hex_to_rgba(theme.foreground, 0.6)
+    border = theme.chrome_border
+    input_bg = theme.background
+    accent = theme.keyword
+    radius = theme.radius
+
+    # Win95: explicit per-side beveled borders
+    if theme.is_beveled:
+        input_border = theme.bevel_sunken
+        input_border_focus = theme.bevel_sunken
+        btn_border = theme.bevel_raised
+    else:
+        input_border = f"border: 1px solid {border};"
+        input_border_focus = f"border: 1px solid {accent};"
+        btn_border = f"border: 1px solid {border};"
+
+    return f"""
+        QWidget {{
+            background-color: {bg};
+            color: {text};
+            font-size: 11px;
+        }}
+        QLabel {{
+            background-color: transparent;
+            color: {text_dim};
+        }}
+        QLineEdit {{
+            background-color: {input_bg};
+            color: {text};
+            {input_border}
+            border-radius: {radius};
+            padding: 4px 8px;
+        }}
+        QLineEdit:focus {{
+            {input_border_focus}
+        }}
+        QPushButton {{
+            background-color: transparent;
+            color: {text_dim};
+            {btn_border}
+            border-radius: {radius};
+            padding: 4px 10px;
+        }}
+        QPushButton:hover {{
+            background-color: {input_bg};
+            color: {text};
+        }}
+        QPushButton:pressed {{
+            background-color: {theme.selection};
+        }}
+        QCheckBox {{
+            color: {text_dim};
+            spacing: 4px;
+        }}
+        QCheckBox::indicator {{
+            width: 14px;
+            height: 14px;
+            {input_border}
+            border-radius: {radius};
+            background-color: {input_bg};
+        }}
+        QCheckBox::indicator:checked {{
+            background-color: {accent};
+            border-color: {accent};
+        }}
+        QPushButton#closeBtn {{
+            background-color: transparent;
+            color: {text_dim};
+            border: none;
+            border-radius: {radius};
+        }}
+        QPushButton#closeBtn:hover {{
+            color: {text};
+            border: 1px solid {text_dim};
+        }}
+        QPushButton#closeBtn:pressed {{
+            background-color: {accent};
+            color: {bg};
+            border: 1px solid {accent};
+        }}
+    """
+
+
+def _utf16_len(text: str) -> int:
+    """Length of text in QTextDocument positions (UTF-16 code units)."""
+    return len(text.encode("utf-16-le")) // 2
+
 
 class FindReplaceBar(QWidget):
     """Horizontal bar for find and replace functionality."""
@@ -26,7 +135,28 @@ class FindReplaceBar(QWidget):
         super().__init__(parent)
         self._editor = None
         self._last_search = ""
+        # Casefolded query for case-insensitive comparisons (only kept up to date in that mode)
+        self._search_text_cf = ""
+        # (search text, re.escape'd text) — escaped once per query change
+        self._search_escaped = ("", "")
+        # (search text, case sensitive, compiled pattern) — rebuilt only when either changes
+        self._pattern_cache: tuple[str, bool, QRegularExpression] | None = None
+        # (search text, flags, document revision) of the last match count
+        self._last_match_key: tuple[str, QTextDocument.FindFlag, int] | None = None
+        # (document revision, plain text, lowercased text or None) — reused across
+        # queries until the document changes; the lowercase copy is built on demand
+        self._flat_cache: tuple[int, str, str | None] | None = None
+        # ((revision, escaped query, case sensitive), match starts, match ends)
+        self._match_cache: tuple[tuple[int, str, bool], list[int], list[int]] | None = None
         self._settings = SettingsManager()
+        self._style_theme: str | None = None  # theme name of the applied stylesheet
+
+        # Debounce match counting so a burst of keystrokes triggers one scan
+        self._search_timer = QTimer(self)
+        self._search_timer.setSingleShot(True)
+        self._search_timer.setInterval(130)
+        self._search_timer.timeout.connect(self._highlight_all_matches)
+
         self._setup_ui()
         self._apply_style()
 
@@ -114,98 +244,26 @@ class FindReplaceBar(QWidget):
     def _apply_style(self):
         """Apply current theme styling."""
         theme = self._settings.get_current_theme()
-        bg = theme.chrome_bg
-        text = theme.foreground
-        text_dim = hex_to_rgba(theme.foreground, 0.6)
-        border = theme.chrome_border
-        input_bg = theme.background
-        accent = theme.keyword
-        radius = theme.radius
-
-        # Win95: explicit per-side beveled borders
-        if theme.is_beveled:
-            input_border = theme.bevel_sunken
-            input_border_focus = theme.bevel_sunken
-            btn_border = theme.bevel_raised
-        else:
-            input_border = f"border: 1px solid {border};"
-            input_border_focus = f"border: 1px solid {accent};"
-            btn_border = f"border: 1px solid {border};"
-
-        self.setStyleSheet(f"""
-            QWidget {{
-                background-color: {bg};
-                color: {text};
-                font-size: 11px;
-            }}
-            QLabel {{
-                background-color: transparent;
-                color: {text_dim};
-            }}
-            QLineEdit {{
-                background-color: {input_bg};
-                color: {text};
-                {input_border}
-                border-radius: {radius};
-                padding: 4px 8px;
-            }}
-            QLineEdit:focus {{
-                {input_border_focus}
-            }}
-            QPushButton {{
-                background-color: transparent;
-                color: {text_dim};
-                {btn_border}
-                border-radius: {radius};
-                padding: 4px 10px;
-            }}
-            QPushButton:hover {{
-                background-color: {input_bg};
-                color: {text};
-            }}
-            QPushButton:pressed {{
-                background-color: {theme.selection};
-            }}
-            QCheckBox {{
-                color: {text_dim};
-                spacing: 4px;
-            }}
-            QCheckBox::indicator {{
-                width: 14px;
-                height: 14px;
-                {input_border}
-                border-radius: {radius};
-                background-color: {input_bg};
-            }}
-            QCheckBox::indicator:checked {{
-                background-color: {accent};
-                border-color: {accent};
-            }}
-            QPushButton#closeBtn {{
-                background-color: transparent;
-                color: {text_dim};
-                border: none;
-                border-radius: {radius};
-            }}
-            QPushButton#closeBtn:hover {{
-                color: {text};
-                border: 1px solid {text_dim};
-            }}
-            QPushButton#closeBtn:pressed {{
-                background-color: {accent};
-                color: {bg};
-                border: 1px solid {accent};
-            }}
-        """)
+        # setStyleSheet re-polishes every child widget, so skip it when the
+        # theme hasn't changed since the last call
+        if theme.name == self._style_theme:
+            return
+        stylesheet = _STYLESHEET_CACHE.get(theme.name)
+        if stylesheet is None:
+            stylesheet = _STYLESHEET_CACHE[theme.name] = _build_stylesheet(theme)
+        self.setStyleSheet(stylesheet)
+        self._style_theme = theme.name
 
     def apply_theme(self):
         """Public method for external theme updates."""
-        self._settings = SettingsManager()
         self._apply_style()
 
     def set_editor(self, editor):
         """Set the editor to search in."""
         self._editor = editor
+        self._last_match_key = None
+        self._flat_cache = None
+        self._match_cache = None
 
     def show_bar(self, replace_mode: bool = False):
         """Show the find bar and focus the search input."""
@@ -223,6 +281,7 @@ class FindReplaceBar(QWidget):
     def hide_bar(self):
         """Hide the bar and clear highlights."""
         self.hide()
+        self._search_timer.stop()
         self._clear_highlights()
         self.closed.emit()
         # Return focus to editor
@@ -230,8 +289,18 @@ class FindReplaceBar(QWidget):
             self._editor.setFocus()
 
     def _on_search_changed(self):
-        """Handle search text changes."""
-        self._highlight_all_matches()
+        """Handle search text changes (debounced)."""
+        text = self.find_input.text()
+        if text != self._search_escaped[0]:
+            self._search_escaped = (text, re.escape(text) if text else "")
+        if not self.case_checkbox.isChecked():
+            self._search_text_cf = text.casefold()
+        self._search_timer.start()
+
+    def _escaped(self, text: str) -> str:
+        """Return text escaped as a literal pattern, reusing the per-query result."""
+        cached_text, escaped = self._search_escaped
+        return escaped if text == cached_text else re.escape(text)
 
     def _get_find_flags(self) -> QTextDocument.FindFlag:
         """Get search flags based on options."""
@@ -240,8 +309,23 @@ class FindReplaceBar(QWidget):
             flags |= QTextDocument.FindFlag.FindCaseSensitively
         return flags
 
+    def _get_pattern(self, text: str, flags: QTextDocument.FindFlag) -> QRegularExpression:
+        """Return a compiled literal pattern for text, reusing the cached one if possible."""
+        case_sensitive = bool(flags & QTextDocument.FindFlag.FindCaseSensitively)
+        cache = self._pattern_cache
+        if cache is None or cache[0] != text or cache[1] != case_sensitive:
+            options = (
+                QRegularExpression.PatternOption.NoPatternOption
+                if case_sensitive
+                else QRegularExpression.PatternOption.CaseInsensitiveOption
+            )
+            # re.escape output is also a valid literal pattern for PCRE
+            pattern = QRegularExpression(self._escaped(text), options)
+            cache = self._pattern_cache = (text, case_sensitive, pattern)
+        return cache[2]
+
     def _highlight_all_matches(self):
-        """Highlight all matches in the editor."""
+        """Count matches in the editor and show the result."""
         if not self._editor:
             return
 
@@ -249,19 +333,51 @@ class FindReplaceBar(QWidget):
         self._clear_highlights()
 
         if not search_text:
+            self._last_match_key = None
             self.match_label.setText("")
             return
 
-        # Count matches
+        # Skip the rescan if neither the query nor the document changed
         document = self._editor.document()
-        cursor = document.find(search_text, 0, self._get_find_flags())
-        count = 0
+        flags = self._get_find_flags()
+        key = (search_text, flags, document.revision())
+        if key == self._last_match_key:
+            return
+        self._last_match_key = key
 
-        while not cursor.isNull():
-            count += 1
-            cursor = document.find(search_text, cursor, self._get_find_flags())
+        # Plain substring count in C over the cached snapshot — far cheaper than
+        # iterating regex matches. It holds the GIL throughout, so a worker
+        # thread would not keep the UI any more responsive.
+        if flags & QTextDocument.FindFlag.FindCaseSensitively:
+            text, needle = self._flat_text(), search_text
+        else:
+            text, needle = self._flat_lower(), search_text.lower()
+        self._show_count(min(text.count(needle), MATCH_COUNT_LIMIT))
 
-        if count > 0:
+    def _flat_text(self) -> str:
+        """Return the editor's plain text, cached until the document revision changes."""
+        document = self._editor.document()
+        revision = document.revision()
+        cache = self._flat_cache
+        if cache is None or cache[0] != revision:
+            cache = self._flat_cache = (revision, document.toPlainText(), None)
+        return cache[1]
+
+    def _flat_lower(self) -> str:
+        """Return the lowercased plain text, built once per document revision."""
+        flat = self._flat_text()
+        revision, _, lower = self._flat_cache
+        if lower is None:
+            lower = flat.lower()
+            self._flat_cache = (revision, flat, lower)
+        return lower
+
+    def _show_count(self, count: int):
+        """Show a match count in the label."""
+        if count >= MATCH_COUNT_LIMIT:
+            self.match_label.setText(f"{MATCH_COUNT_LIMIT}+ found")
+            self.match_label.setStyleSheet("background: transparent; color: #c8e0ce;")
+        elif count > 0:
             self.match_label.setText(f"{count} found")
             self.match_label.setStyleSheet("background: transparent; color: #c8e0ce;")
         else:
@@ -283,15 +399,14 @@ class FindReplaceBar(QWidget):
         if not search_text:
             return
 
-        flags = self._get_find_flags()
-        found = self._editor.find(search_text, flags)
-
-        # Wrap around to beginning
-        if not found:
-            cursor = self._editor.textCursor()
-            cursor.movePosition(cursor.MoveOperation.Start)
-            self._editor.setTextCursor(cursor)
-            self._editor.find(search_text, flags)
+        starts, ends = self._match_spans(search_text, self.case_checkbox.isChecked())
+        if not starts:
+            return
+        # First match at or after the current selection, wrapping to the first
+        i = bisect.bisect_left(starts, self._editor.textCursor().selectionEnd())
+        if i == len(starts):
+            i = 0
+        self._select_match(starts[i], ends[i])
 
     def find_prev(self):
         """Find the previous occurrence."""
@@ -302,15 +417,45 @@ class FindReplaceBar(QWidget):
         if not search_text:
             return
 
-        flags = self._get_find_flags() | QTextDocument.FindFlag.FindBackward
-        found = self._editor.find(search_text, flags)
-
-        # Wrap around to end
-        if not found:
-            cursor = self._editor.textCursor()
-            cursor.movePosition(cursor.MoveOperation.End)
-            self._editor.setTextCursor(cursor)
-            self._editor.find(search_text, flags)
+        starts, ends = self._match_spans(search_text, self.case_checkbox.isChecked())
+        if not starts:
+            return
+        # Last match before the current selection; index -1 wraps to the last one
+        i = bisect.bisect_left(starts, self._editor.textCursor().selectionStart()) - 1
+        self._select_match(starts[i], ends[i])
+
+    def _match_spans(self, search_text: str, case_sensitive: bool) -> tuple[list[int], list[int]]:
+        """Return sorted match (starts, ends) as document positions.
+
+        Scans the plain text once per (document revision, query); navigation
+        then bisects this list instead of re-running QTextDocument.find().
+        """
+        escaped = self._escaped(search_text)
+        key = (self._editor.document().revision(), escaped, case_sensitive)
+        cache = self._match_cache
+        if cache is None or cache[0] != key:
+            flat = self._flat_text()
+            pattern = re.compile(escaped, 0 if case_sensitive else re.IGNORECASE)
+            spans = [m.span() for m in pattern.finditer(flat)]
+            starts = [start for start, _ in spans]
+            ends = [end for _, end in spans]
+            # Document positions count UTF-16 units, so characters outside the
+            # BMP shift every later position by one
+            if not flat.isascii():
+                astral = [m.start() for m in _ASTRAL_CHAR.finditer(flat)]
+                if astral:
+                    starts = [pos + bisect.bisect_left(astral, pos) for pos in starts]
+                    ends = [pos + bisect.bisect_left(astral, pos) for pos in ends]
+            cache = self._match_cache = (key, starts, ends)
+        return cache[1], cache[2]
+
+    def _select_match(self, start: int, end: int):
+        """Select the document range [start, end) in the editor and scroll to it."""
+        cursor = self._editor.textCursor()
+        cursor.setPosition(start)
+        cursor.setPosition(end, cursor.MoveMode.KeepAnchor)
+        self._editor.setTextCursor(cursor)
+        self._editor.ensureCursorVisible()
 
     def replace_current(self):
         """Replace the current selection if it matches."""
@@ -330,10 +475,11 @@ class FindReplaceBar(QWidget):
             if self.case_checkbox.isChecked():
                 matches = selected == search_text
             else:
-                matches = selected.lower() == search_text.lower()
+                matches = selected.casefold() == self._search_text_cf
 
             if matches:
                 cursor.insertText(replace_text)
+                # One C-level recount; find_next below rescans for spans anyway
                 self._highlight_all_matches()
 
         # Find next match
@@ -350,25 +496,110 @@ class FindReplaceBar(QWidget):
         if not search_text:
             return
 
-        # Start from beginning
-        cursor = self._editor.textCursor()
-        cursor.movePosition(cursor.MoveOperation.Start)
-        self._editor.setTextCursor(cursor)
-
-        # Replace all
-        count = 0
-        flags = self._get_find_flags()
+        # Batch the edit: no repaints and no per-match cursor/text signal
+        # handlers (current-line highlight, status bar) until it is done
+        editor = self._editor
+        editor.setUpdatesEnabled(False)
+        editor.blockSignals(True)
+        try:
+            if self.case_checkbox.isChecked():
+                count = self._replace_all_literal(search_text, replace_text)
+            else:
+                count = self._replace_all_by_find(search_text, replace_text)
+        finally:
+            editor.blockSignals(False)
+            editor.setUpdatesEnabled(True)
+        self._flat_cache = None
 
-        # Use document-level find for efficiency
+        if count > 0:
+            # Replay the suppressed signals once so listeners catch up. Undo
+            # availability goes out through the document, which the editor
+            # forwards, since the find loop blocked the document's own emits.
+            document = editor.document()
+            document.undoAvailable.emit(document.isUndoAvailable())
+            document.redoAvailable.emit(document.isRedoAvailable())
+            editor.blockCountChanged.emit(editor.blockCount())
+            editor.textChanged.emit()
+            editor.cursorPositionChanged.emit()
+            editor.updateRequest.emit(editor.viewport().rect(), 0)
+        editor.viewport().update()
+
+        # The replace count is already known — report it instead of rescanning.
+        # The remaining-match count is only recomputed on the next query change.
+        if count > 0:
+            self._last_match_key = None
+            self.match_label.setText(f"{count} replaced")
+        else:
+            key = (search_text, self._get_find_flags(), editor.document().revision())
+            self._last_match_key = key
+            self._show_count(0)
+
+    def _replace_all_literal(self, search_text: str, replace_text: str) -> int:
+        """Case-sensitive replace all as one str.replace and a single document insert.
+
+        Replaces the per-match find/insert loop (one layout update per match)
+        with one edit when matches are dense enough to pay for re-laying out
+        the whole document; sparse matches go through the find loop. Uses
+        toRawText() so characters such as non-breaking spaces survive.
+        """
+        document = self._editor.document()
+        text = document.toRawText()
+        # split() cuts at the same non-overlapping matches replace() would
+        pieces = text.split(search_text)
+        count = len(pieces) - 1
+        if count < document.blockCount() * _REWRITE_MATCHES_PER_BLOCK:
+            return self._replace_all_by_find(search_text, replace_text)
+
+        cursor = QTextCursor(document)
+        cursor.select(QTextCursor.SelectionType.Document)
         cursor.beginEditBlock()
-        while self._editor.find(search_text, flags):
-            tc = self._editor.textCursor()
-            tc.insertText(replace_text)
-            count += 1
+        cursor.insertText(replace_text.join(pieces))
         cursor.endEditBlock()
+        # Leave the caret after the last replacement: only the text after the
+        # last match is unchanged, and it ends the document
+        cursor.setPosition(document.characterCount() - 1 - _utf16_len(pieces[-1]))
+        self._editor.setTextCursor(cursor)
+        return count
 
-        # Update match count
-        self._highlight_all_matches()
+    def _replace_all_by_find(self, search_text: str, replace_text: str) -> int:
+        """Replace all by walking matches with document.find()."""
+        document = self._editor.document()
+        flags = self._get_find_flags()
+        pattern = self._get_pattern(search_text, flags)
+        find = document.find
 
-        if count > 0:
-            self.match_label.setText(f"{count} replaced")
+        # Search with a detached cursor: the editor's own cursor isn't moved
+        # (and the view isn't scrolled) for every match. Document signals are
+        # held back so the highlighter and other listeners run once for the
+        # whole batch instead of once per insert.
+        count = 0
+        first = -1
+        last = None
+        was_modified = document.isModified()
+        cursor = QTextCursor(document)
+        blocker = QSignalBlocker(document)
+        try:
+            cursor.beginEditBlock()
+            match = find(pattern, 0, flags)
+            if not match.isNull():
+                first = match.selectionStart()
+            while not match.isNull():
+                match.insertText(replace_text)
+                count += 1
+                last = match
+                match = find(pattern, match, flags)
+            cursor.endEditBlock()
+        finally:
+            blocker.unblock()
+
+        if last is not None:
+            # One change notification spanning every replacement
+            document.contentsChange.emit(first, 0, last.position() - first)
+            document.contentsChanged.emit()
+            if document.isModified() != was_modified:
+                document.modificationChanged.emit(document.isModified())
+
+        # Leave the caret after the last replacement, assigned once
+        if last is not None:
+            self._editor.setTextCursor(last)
+        return count
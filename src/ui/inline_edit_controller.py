@@ -8,14 +8,18 @@ and accept/cancel flows. Communicates with editors via signals.
 import contextlib
 from collections.abc import Callable
 
-from PyQt6.QtCore import QObject
-from PyQt6.QtGui import QAction, QKeySequence
+from PyQt6.QtCore import QObject, Qt, QTimer
+from PyQt6.QtGui import QAction, QKeySequence, QTextCursor
 from PyQt6.QtWidgets import QMainWindow
 
 from ai.worker import AIManager
 from ui.editor_tab import EditorTab
 from ui.side_panel import LayoutMode
 
+# Live-preview flush interval: ~one frame at 60 Hz, so a burst of tokens
+# costs one document edit and one repaint instead of one per token
+_STREAM_FLUSH_MS = 16
+
 
 class InlineEditController(QObject):
     """Manages Ctrl+K inline AI editing lifecycle.
@@ -38,19 +42,40 @@ class InlineEditController(QObject):
         self._get_layout_mode = get_layout_mode
         self._show_status = show_status
 
-        # AI backend
+        # AI backend — queued explicitly so tokens are always handled from the
+        # event loop (in emission order) and never re-entrantly from emit()
+        queued = Qt.ConnectionType.QueuedConnection
         self._manager = AIManager(parent)
-        self._manager.token_received.connect(self._on_token)
-        self._manager.generation_finished.connect(self._on_finished)
-        self._manager.generation_error.connect(self._on_error)
+        self._manager.token_received.connect(self._on_token, queued)
+        self._manager.generation_finished.connect(self._on_finished, queued)
+        self._manager.generation_error.connect(self._on_error, queued)
 
-        # Streaming state
+        # Streaming state — tokens are collected in _buffer_parts and joined
+        # into _buffer once, when generation finishes
         self._buffer = ""
+        self._buffer_parts: list[str] = []
         self._selection_start = -1
         self._selection_end = -1
         self._active = False
         self._prev_editor: EditorTab | None = None
 
+        # Live preview — tokens are written into the document as they arrive,
+        # coalesced by _stream_timer. _stream_start and _stream_cursor mark the
+        # start and end of the streamed text and move with any other edits;
+        # both are None until the first flush replaces the selection.
+        self._stream_start: QTextCursor | None = None
+        self._stream_cursor: QTextCursor | None = None
+        self._stream_original = ""  # selected text the preview replaced
+        # Document revision after the last flush, and whether every flush so
+        # far joined one undo step (so a single undo() removes the preview)
+        self._stream_revision = -1
+        self._stream_single_step = True
+        self._pending_tokens: list[str] = []
+        self._stream_timer = QTimer(self)
+        self._stream_timer.setSingleShot(True)
+        self._stream_timer.setInterval(_STREAM_FLUSH_MS)
+        self._stream_timer.timeout.connect(self._flush_stream)
+
     def setup(self, window: QMainWindow) -> None:
         """Register Ctrl+K shortcut on the window."""
         action = QAction(window.tr("Inline AI Edit"), window)
@@ -88,7 +113,9 @@ class InlineEditController(QObject):
         """Stop any active generation."""
         if self._active:
             self._manager.stop()
+            self._revert_stream()
             self._buffer = ""
+            self._buffer_parts.clear()
             self._active = False
 
     def stop_manager(self) -> None:
@@ -136,6 +163,7 @@ class InlineEditController(QObject):
         self._selection_start = cursor.selectionStart()
         self._selection_end = cursor.selectionEnd()
         self._buffer = ""
+        self._buffer_parts.clear()
         self._active = True
 
         # Update bar status
@@ -172,38 +200,105 @@ class InlineEditController(QObject):
         )
 
     def _on_token(self, token: str) -> None:
-        """Collect streamed tokens into the buffer."""
-        self._buffer += token
+        """Collect streamed tokens and schedule a live preview flush."""
+        if not self._active:
+            return  # late token queued before a stop()
+        self._buffer_parts.append(token)
+        self._pending_tokens.append(token)
+        if not self._stream_timer.isActive():
+            self._stream_timer.start()
+
+    def _flush_stream(self) -> None:
+        """Write pending tokens into the document as part of one undo step."""
+        self._stream_timer.stop()
+        if not self._pending_tokens:
+            return
+        text = "".join(self._pending_tokens)
+        self._pending_tokens.clear()
+
+        cursor = self._stream_cursor
+        if cursor is None:
+            editor = self._get_editor()
+            if not editor:
+                return
+            # First flush replaces the saved selection and opens the undo step
+            document = editor.document()
+            cursor = QTextCursor(document)
+            cursor.setPosition(self._selection_start)
+            cursor.setPosition(self._selection_end, cursor.MoveMode.KeepAnchor)
+            self._stream_original = cursor.selectedText()
+            self._stream_start = QTextCursor(document)
+            self._stream_start.setPosition(self._selection_start)
+            # Stay before the preview rather than riding along as it is inserted
+            self._stream_start.setKeepPositionOnInsert(True)
+            self._stream_single_step = True
+            cursor.beginEditBlock()
+            self._stream_cursor = cursor
+        elif cursor.document().revision() == self._stream_revision:
+            cursor.joinPreviousEditBlock()
+        else:
+            # The user edited since the last flush; don't fold into their step
+            self._stream_single_step = False
+            cursor.beginEditBlock()
+        cursor.insertText(text)
+        cursor.endEditBlock()
+        self._stream_revision = cursor.document().revision()
+
+    def _revert_stream(self) -> None:
+        """Remove a partially streamed preview, restoring the original selection."""
+        self._stream_timer.stop()
+        self._pending_tokens.clear()
+        cursor, start = self._stream_cursor, self._stream_start
+        self._stream_cursor = self._stream_start = None
+        if cursor is None or start is None or cursor.document() is None:
+            return
+        document = cursor.document()
+        if self._stream_single_step and document.revision() == self._stream_revision:
+            # The preview is exactly the top undo step
+            document.undo()
+            return
+        # Other edits are interleaved: replace just the streamed range
+        cursor.setPosition(start.position(), cursor.MoveMode.KeepAnchor)
+        cursor.insertText(self._stream_original)
 
     def _on_finished(self) -> None:
         """Handle AI generation complete — replace selection with result."""
+        self._flush_stream()
+        self._buffer = "".join(self._buffer_parts)
+        self._buffer_parts.clear()
+        self._active = False
+
         editor = self._get_editor()
         if not editor:
+            self._revert_stream()
             return
 
         code = self._strip_code_fences(self._buffer)
-        self._active = False
 
-        if not code.strip():
+        if not code.strip() or self._stream_cursor is None:
+            self._revert_stream()
             bar = editor.get_inline_edit_bar()
             if bar:
                 bar.set_error("AI returned empty response")
             return
 
-        # Replace selection as a single undo operation
-        cursor = editor.textCursor()
-        cursor.setPosition(self._selection_start)
-        cursor.setPosition(self._selection_end, cursor.MoveMode.KeepAnchor)
-
-        cursor.beginEditBlock()
-        cursor.insertText(code)
-        cursor.endEditBlock()
-
-        # Calculate the end position of inserted text
-        insert_end = self._selection_start + len(code)
+        # Swap the raw streamed text for the fence-stripped result, folded
+        # into the same undo step as the preview when nothing came between
+        cursor, start = self._stream_cursor, self._stream_start
+        self._stream_cursor = self._stream_start = None
+        insert_start = start.position()
+        if code != self._buffer:
+            cursor.setPosition(insert_start, cursor.MoveMode.KeepAnchor)
+            if cursor.document().revision() == self._stream_revision:
+                cursor.joinPreviousEditBlock()
+            else:
+                cursor.beginEditBlock()
+            cursor.insertText(code)
+            cursor.endEditBlock()
+        insert_end = cursor.position()
 
         # Highlight the replaced region
-        editor.highlight_edited_region(self._selection_start, insert_end)
+        editor.highlight_edited_region(insert_start, insert_end)
 
         # Update bar status
         bar = editor.get_inline_edit_bar()
@@ -216,6 +311,8 @@ class InlineEditController(QObject):
 
     def _on_error(self, error: str) -> None:
         """Handle AI generation error."""
+        self._revert_stream()
+        self._buffer_parts.clear()
         self._active = False
         editor = self._get_editor()
         if editor:
@@ -249,10 +346,16 @@ class InlineEditController(QObject):
 
     @staticmethod
     def _strip_code_fences(code: str) -> str:
-        """Strip markdown code fences from AI response."""
-        lines = code.strip().split("\n")
-        if lines and lines[0].startswith("```"):
-            lines = lines[1:]
-        if lines and lines[-1].strip() == "```":
-            lines = lines[:-1]
-        return "\n".join(lines)
+        """Strip markdown code fences from AI response.
+
+        Slices the string around the first and last line instead of
+        splitting the whole response into lines.
+        """
+        text = code.strip()
+        if text.startswith("```"):
+            newline = text.find("\n")
+            text = text[newline + 1 :] if newline != -1 else ""
+        newline = text.rfind("\n")
+        if text[newline + 1 :].strip() == "```":
+            text = text[:newline] if newline != -1 else ""
+        return text
@@ -7,7 +7,8 @@ Pulses gold border during generation, turns green on completion.
 
 from enum import Enum, auto
 
-from PyQt6.QtCore import Qt, QTimer, pyqtSignal
+from PyQt6.QtCore import QPropertyAnimation, QRect, QRectF, Qt, pyqtProperty, pyqtSignal
+from PyQt6.QtGui import QColor, QPainter, QPainterPath, QPalette, QPen
 from PyQt6.QtWidgets import (
     QHBoxLayout,
     QLabel,
@@ -34,19 +35,27 @@ class _InlineLineEdit(QLineEdit):
     tab_pressed = pyqtSignal()
     escape_pressed = pyqtSignal()
 
+    # Plain ints so the per-keystroke checks skip enum attribute lookups
+    _KEYS_ENTER = frozenset((Qt.Key.Key_Return.value, Qt.Key.Key_Enter.value))
+    _KEY_TAB = Qt.Key.Key_Tab.value
+    _KEY_ESCAPE = Qt.Key.Key_Escape.value
+    _FIRST_SPECIAL_KEY = Qt.Key.Key_Escape.value  # keys below this are plain text
+
     def keyPressEvent(self, event) -> None:  # type: ignore[override]
-        if event.key() in (Qt.Key.Key_Return, Qt.Key.Key_Enter):
-            self.enter_pressed.emit()
-            event.accept()
-            return
-        if event.key() == Qt.Key.Key_Tab:
-            self.tab_pressed.emit()
-            event.accept()
-            return
-        if event.key() == Qt.Key.Key_Escape:
-            self.escape_pressed.emit()
-            event.accept()
-            return
+        key = event.key()
+        if key >= self._FIRST_SPECIAL_KEY:
+            if key in self._KEYS_ENTER:
+                self.enter_pressed.emit()
+                event.accept()
+                return
+            if key == self._KEY_TAB:
+                self.tab_pressed.emit()
+                event.accept()
+                return
+            if key == self._KEY_ESCAPE:
+                self.escape_pressed.emit()
+                event.accept()
+                return
         super().keyPressEvent(event)
 
 
@@ -56,6 +65,56 @@ _GOLD_DIM = "#9A7D2E"
 _GREEN = "#5CB85C"
 _RED = "#C45C5C"
 
+# Built stylesheets per theme name — themes are fixed, so each is built at most once
+_STYLESHEET_CACHE: dict[str, tuple[str, QColor]] = {}
+
+
+def _build_stylesheet(theme: EditorTheme) -> tuple[str, QColor]:
+    """Build the bar + child widget stylesheet and the bar background color for a theme."""
+    bg = EditorTheme._darken(theme.chrome_bg, 8)
+    if theme.is_beveled:
+        # Win95 keeps its fixed bevel border in every state, drawn by QSS
+        bar_qss = f"""
+            QWidget#IEBar {{
+                background-color: {bg};
+                {theme.bevel_raised}
+                border-radius: {theme.radius_large};
+            }}
+        """
+    else:
+        # Background and state-colored border are drawn in paintEvent
+        bar_qss = """
+            QWidget#IEBar {
+                background: transparent;
+                border: none;
+            }
+        """
+
+    # Child widget styles (stable, don't change with state)
+    child_qss = f"""
+        QLineEdit#IEInput {{
+            background-color: transparent;
+            color: {theme.foreground};
+            border: none;
+            padding: 4px 6px;
+            font-family: "Cascadia Code", "Consolas", "Courier New", monospace;
+            font-size: 13px;
+            selection-background-color: {_GOLD_DIM};
+            selection-color: {theme.background};
+        }}
+        QLabel#IEIcon {{
+            background: transparent;
+            border: none;
+            font-size: 14px;
+        }}
+        QLabel#IEHint {{
+            background: transparent;
+            border: none;
+            font-size: 11px;
+        }}
+    """
+    return bar_qss + child_qss, QColor(bg)
+
 
 class InlineEditBar(QWidget):
     """Floating bar for inline AI code editing instructions.
@@ -73,16 +132,23 @@ class InlineEditBar(QWidget):
         self._edit_complete = False
         self._settings = SettingsManager()
         self._state = _BarState.IDLE
-        self._pulse_on = False
         self._error_msg = ""
+        self._border_qcolor = QColor(_GOLD_DIM)
+        self._style_theme: str | None = None  # theme name of the applied stylesheet
+        # Rounded outline for paintEvent, rebuilt only when the size or radius changes
+        self._frame_path: QPainterPath | None = None
+        self._frame_rect = QRect()
 
         self.setObjectName("IEBar")
-        self.setAttribute(Qt.WidgetAttribute.WA_StyledBackground, True)
 
-        # Pulse timer for generating state
-        self._pulse_timer = QTimer(self)
-        self._pulse_timer.setInterval(750)
-        self._pulse_timer.timeout.connect(self._on_pulse_tick)
+        # Border pulse for generating state: animates the border_color property,
+        # which only repaints the bar — no stylesheet churn per frame
+        self._pulse_anim = QPropertyAnimation(self, b"border_color", self)
+        self._pulse_anim.setDuration(1500)
+        self._pulse_anim.setLoopCount(-1)
+        self._pulse_anim.setKeyValueAt(0.0, QColor(_GOLD_DIM))
+        self._pulse_anim.setKeyValueAt(0.5, QColor(_GOLD_BRIGHT))
+        self._pulse_anim.setKeyValueAt(1.0, QColor(_GOLD_DIM))
 
         self._setup_ui()
         self._apply_style()
@@ -122,46 +188,26 @@ class InlineEditBar(QWidget):
     def _apply_style(self) -> None:
         """Apply base styling from current theme, then update visual state."""
         theme = self._settings.get_current_theme()
-        bg = EditorTheme._darken(theme.chrome_bg, 8)
-        fg = theme.foreground
+        # setStyleSheet re-polishes every child widget, so skip it when the
+        # theme hasn't changed since the last call
+        if theme.name == self._style_theme:
+            return
 
         # Store theme values for border updates
-        self._fg = fg
-        self._theme_bg = bg
+        self._fg = theme.foreground
         self._is_beveled = theme.is_beveled
-        self._theme = theme
-
-        # Child widget styles (stable, don't change with state)
-        self._child_qss = f"""
-            QLineEdit#IEInput {{
-                background-color: transparent;
-                color: {fg};
-                border: none;
-                padding: 4px 6px;
-                font-family: "Cascadia Code", "Consolas", "Courier New", monospace;
-                font-size: 13px;
-                selection-background-color: {_GOLD_DIM};
-                selection-color: {theme.background};
-            }}
-            QLabel#IEIcon {{
-                background: transparent;
-                border: none;
-                font-size: 14px;
-            }}
-            QLabel#IEHint {{
-                background: transparent;
-                border: none;
-                font-size: 11px;
-            }}
-        """
-
-        # Build initial bar border
-        if theme.is_beveled:
-            self._bar_border_qss = theme.bevel_raised
-        else:
-            self._bar_border_qss = f"border: 1px solid {_GOLD_DIM};"
-
-        self._rebuild_stylesheet()
+        # Only the Win95 bevel needs QSS to paint the bar; modern themes paint
+        # their own background in paintEvent
+        self.setAttribute(Qt.WidgetAttribute.WA_StyledBackground, theme.is_beveled)
+
+        style = _STYLESHEET_CACHE.get(theme.name)
+        if style is None:
+            style = _STYLESHEET_CACHE[theme.name] = _build_stylesheet(theme)
+        qss, self._bg_qcolor = style
+        self._radius = float(theme.radius_large.removesuffix("px"))
+        self._frame_path = None  # radius may have changed
+        self.setStyleSheet(qss)
+        self._style_theme = theme.name
         self._update_visual_state()
 
     def _update_visual_state(self) -> None:
@@ -173,8 +219,7 @@ class InlineEditBar(QWidget):
         elif self._state == _BarState.GENERATING:
             self._set_icon("\u25c8", _GOLD_BRIGHT)
             self._set_hint("Generating\u2026", _GOLD_BRIGHT)
-            border = _GOLD_BRIGHT if self._pulse_on else _GOLD_DIM
-            self._set_border(border)
+            self._start_pulse()
         elif self._state == _BarState.COMPLETE:
             self._set_icon("\u2713", _GREEN)
             self._set_hint("Enter \u2713 \u00b7 Esc \u2717", _GOLD_DIM)
@@ -186,49 +231,87 @@ class InlineEditBar(QWidget):
 
     def _set_icon(self, char: str, color: str) -> None:
         self._icon_label.setText(char)
-        self._icon_label.setStyleSheet(
-            f"color: {color}; background: transparent; border: none; font-size: 14px;"
-        )
+        self._set_label_color(self._icon_label, color)
 
     def _set_hint(self, text: str, color: str) -> None:
         self._status_label.setText(text)
-        self._status_label.setStyleSheet(
-            f"color: {color}; background: transparent; border: none; font-size: 11px;"
-        )
+        self._set_label_color(self._status_label, color)
+
+    @staticmethod
+    def _set_label_color(label: QLabel, color: str) -> None:
+        """Recolor a label via its palette; font and background come from the bar QSS."""
+        palette = label.palette()
+        qcolor = QColor(color)
+        if palette.color(QPalette.ColorRole.WindowText) == qcolor:
+            return  # e.g. repeated set_status() with the same hint color
+        palette.setColor(QPalette.ColorRole.WindowText, qcolor)
+        label.setPalette(palette)
 
     def _set_border(self, color: str) -> None:
-        """Update the outer border color by rebuilding the stylesheet."""
+        """Stop any pulse and show a fixed border color."""
+        self._pulse_anim.stop()
         if self._is_beveled:
             return  # Win95 uses bevel borders, don't override
-        self._bar_border_qss = f"border: 1px solid {color};"
-        self._rebuild_stylesheet()
-
-    def _rebuild_stylesheet(self) -> None:
-        """Rebuild the full stylesheet from stored parts."""
-        radius = self._theme.radius_large
-        self.setStyleSheet(
-            f"""
-            QWidget#IEBar {{
-                background-color: {self._theme_bg};
-                {self._bar_border_qss}
-                border-radius: {radius};
-            }}
-            {self._child_qss}
-        """
-        )
+        self._set_border_color(QColor(color))
+
+    def _get_border_color(self) -> QColor:
+        return self._border_qcolor
+
+    def _set_border_color(self, color: QColor) -> None:
+        if color == self._border_qcolor:
+            return  # e.g. IDLE -> IDLE, no repaint needed
+        self._border_qcolor = color
+        self.update()
+
+    border_color = pyqtProperty(QColor, fget=_get_border_color, fset=_set_border_color)
+
+    def paintEvent(self, event) -> None:  # type: ignore[override]
+        """Draw the rounded background and state-colored border (modern themes)."""
+        if self._is_beveled:
+            super().paintEvent(event)
+            return
+        painter = QPainter(self)
+        painter.setRenderHint(QPainter.RenderHint.Antialiasing)
+        painter.setPen(QPen(self._border_qcolor, 1))
+        painter.setBrush(self._bg_qcolor)
+        rect = self.rect()
+        if self._frame_path is None or rect != self._frame_rect:
+            # Half-pixel inset keeps the 1px stroke crisp and inside the widget
+            self._frame_path = QPainterPath()
+            self._frame_path.addRoundedRect(
+                QRectF(rect).adjusted(0.5, 0.5, -0.5, -0.5), self._radius, self._radius
+            )
+            self._frame_rect = rect
+        painter.drawPath(self._frame_path)
 
     # -- Pulse animation ------------------------------------------------------
 
-    def _on_pulse_tick(self) -> None:
-        """Toggle pulse state and update border."""
-        self._pulse_on = not self._pulse_on
-        self._update_visual_state()
+    def _start_pulse(self) -> None:
+        """Start the gold border pulse (not used for beveled themes)."""
+        if self._is_beveled or not self.isVisible():
+            return  # showEvent starts it once the bar is on screen
+        state = self._pulse_anim.state()
+        if state == QPropertyAnimation.State.Paused:
+            self._pulse_anim.resume()
+        elif state == QPropertyAnimation.State.Stopped:
+            self._pulse_anim.start()
+
+    def showEvent(self, event) -> None:  # type: ignore[override]
+        """Resume the pulse when the bar (or its editor tab) is shown again."""
+        super().showEvent(event)
+        if self._state == _BarState.GENERATING:
+            self._start_pulse()
+
+    def hideEvent(self, event) -> None:  # type: ignore[override]
+        """Pause the pulse while hidden, e.g. when another editor tab is active."""
+        if self._pulse_anim.state() == QPropertyAnimation.State.Running:
+            self._pulse_anim.pause()
+        super().hideEvent(event)
 
     # -- Public API -----------------------------------------------------------
 
     def apply_theme(self) -> None:
         """Public method for external theme updates."""
-        self._settings = SettingsManager()
         self._apply_style()
 
     def show_bar(self) -> None:
@@ -245,11 +328,11 @@ class InlineEditBar(QWidget):
 
     def hide_bar(self) -> None:
         """Hide the bar and return focus to parent."""
-        self._pulse_timer.stop()
-        self._pulse_on = False
+        self._pulse_anim.stop()
         self.hide()
-        if self.parent():
-            self.parent().setFocus()
+        parent = self.parentWidget()
+        if parent is not None:
+            parent.setFocus()
 
     def set_status(self, text: str) -> None:
         """Update the status hint text (used externally for custom messages)."""
@@ -261,12 +344,8 @@ class InlineEditBar(QWidget):
         if generating:
             self._edit_complete = False
             self._state = _BarState.GENERATING
-            self._pulse_on = False
-            self._pulse_timer.start()
         else:
             self._edit_complete = True
-            self._pulse_timer.stop()
-            self._pulse_on = False
             self._state = _BarState.COMPLETE
             self.instruction_input.setFocus()
         self._update_visual_state()
@@ -275,8 +354,6 @@ class InlineEditBar(QWidget):
         """Show error message in red."""
         self._error_msg = message
         self._state = _BarState.ERROR
-        self._pulse_timer.stop()
-        self._pulse_on = False
         self.instruction_input.setEnabled(True)
         self._edit_complete = False
         self._update_visual_state()
@@ -2,12 +2,18 @@
 Main application window with tabs, menus, and toolbar.
 """
 
+from __future__ import annotations
+
+import functools
+import re
 import time
 from pathlib import Path
+from typing import TYPE_CHECKING
 
 from PyQt6.QtCore import (
     QEasingCurve,
     QEvent,
+    QMetaObject,
     QPropertyAnimation,
     QSettings,
     Qt,
@@ -18,6 +24,7 @@ from PyQt6.QtGui import (
     QActionGroup,
     QKeySequence,
     QPixmap,
+    QTextCursor,
 )
 from PyQt6.QtWidgets import (
     QDockWidget,
@@ -40,26 +47,98 @@ from ui.activity_bar import ActivityBar
 from ui.completion_controller import CompletionController
 from ui.custom_tab_bar import CustomTabBar
 from ui.editor_tab import EditorTab
-from ui.file_browser import FileBrowserPanel
 from ui.find_replace import FindReplaceBar
 from ui.inline_edit_controller import InlineEditController
-from ui.settings_dialog import SettingsDialog
 from ui.side_panel import LayoutMode, SidePanel
 from ui.status_bar_manager import StatusBarManager
 from ui.theme_engine import ThemeEngine, hex_to_rgba
 from ui.title_bar import TitleBarController
 from ui.toolbar_widgets import FormattingToolbar
 
+if TYPE_CHECKING:
+    from ui.file_browser import FileBrowserPanel
+
+# Code block language tags (as written in AI replies) -> editor language
+_CODE_BLOCK_LANGUAGES = {
+    "python": Language.PYTHON,
+    "py": Language.PYTHON,
+    "javascript": Language.JAVASCRIPT,
+    "js": Language.JAVASCRIPT,
+    "html": Language.HTML,
+    "css": Language.CSS,
+    "json": Language.JSON,
+    "markdown": Language.MARKDOWN,
+    "md": Language.MARKDOWN,
+}
+
+# Markdown syntax stripped by Clear Formatting, applied in order
+_MARKDOWN_STRIP_PATTERNS = (
+    (re.compile(r"\*\*(.+?)\*\*"), r"\1"),  # **bold**
+    (re.compile(r"\*(.+?)\*"), r"\1"),  # *italic*
+    (re.compile(r"^#{1,6}\s+", re.MULTILINE), ""),  # headings
+    (re.compile(r"\[([^\]]+)\]\([^)]+\)"), r"\1"),  # [text](url)
+    (re.compile(r"!\[([^\]]*)\]\([^)]+\)"), r"\1"),  # ![alt](img)
+    (re.compile(r"~~(.+?)~~"), r"\1"),  # ~~strikethrough~~
+    (re.compile(r"`(.+?)`"), r"\1"),  # `inline code`
+)
+
+# Name filters shared by the Open and Save As dialogs
+_FILE_FILTER = (
+    "All Files (*);;Text Files (*.txt);;Python (*.py);;JavaScript (*.js);;"
+    "HTML (*.html);;CSS (*.css);;JSON (*.json);;Markdown (*.md)"
+)
+
+# Upper bound on editor text sent to the AI when there is no selection
+_MAX_CONTEXT_CHARS = 65_536
+
+
+def _editor_context(editor: EditorTab) -> str:
+    """Return the editor text, capped to a window around the cursor for large files."""
+    doc = editor.document()
+    length = doc.characterCount() - 1  # Excludes the trailing paragraph separator
+    if length <= _MAX_CONTEXT_CHARS:
+        return editor.toPlainText()
+
+    # Copy only the window instead of the whole (possibly multi-MB) document
+    end = min(length, editor.textCursor().position() + _MAX_CONTEXT_CHARS // 2)
+    start = max(0, end - _MAX_CONTEXT_CHARS)
+    end = start + _MAX_CONTEXT_CHARS
+    cursor = QTextCursor(doc)
+    cursor.setPosition(start)
+    cursor.setPosition(end, QTextCursor.MoveMode.KeepAnchor)
+    # QTextCursor uses Unicode paragraph separator, replace with newline
+    return cursor.selectedText().replace("\u2029", "\n")
+
 
 class MainWindow(QMainWindow):
     """Main application window."""
 
+    # Markdown inserted by the formatting toolbar
+    _BOLD_MARKER = "**"
+    _ITALIC_MARKER = "*"
+    _BULLET_MARKER = "- "
+    _NUMBER_MARKER = "1. "
+    _LINK_MARKERS = ("[", "](url)")
+    _LINK_PLACEHOLDER = "text"
+    _HEADING_PREFIXES = ("", "# ", "## ", "### ", "#### ", "##### ", "###### ")
+
+    # Skip per-entry icon lookups and symlink resolution; both stat every
+    # entry and crawl on network drives
+    _FILE_DIALOG_OPTIONS = (
+        QFileDialog.Option.DontUseCustomDirectoryIcons | QFileDialog.Option.DontResolveSymlinks
+    )
+
     def __init__(self, parent=None):
         super().__init__(parent)
         self.settings = QSettings("MyNotion", "Editor")
         self.settings_manager = SettingsManager()
         self.recent_files = RecentFilesManager(self)
         self._title_bar_ctrl = TitleBarController(self)
+        # Open editors in creation order, kept in step with new_tab/close_tab
+        # so bulk updates skip the per-tab widget lookup and type check
+        self._editor_tabs: list[EditorTab] = []
+        # Each editor's modificationChanged connection, so close_tab can undo it
+        self._modified_connections: dict[EditorTab, QMetaObject.Connection] = {}
 
         self._setup_ui()
         self._setup_side_panel()
@@ -84,13 +163,14 @@ class MainWindow(QMainWindow):
         self._theme_engine = ThemeEngine(self, self.settings_manager)
         self._theme_engine.apply_theme()
         self._theme_engine.apply_child_themes()
+        self._applied_appearance = self._appearance_key()
         self._restore_geometry()
 
         # Track manual layout mode switches (30s cooldown for auto-switch)
         self._last_manual_mode_switch: float = 0.0
 
         # Connect recent files changes
-        self.recent_files.files_changed.connect(self._update_recent_menu)
+        self.recent_files.files_changed.connect(self._mark_recent_menu_dirty)
 
         # Restore previous session or create a blank tab
         if not self._restore_session():
@@ -150,36 +230,21 @@ class MainWindow(QMainWindow):
 
         # Create + button on the tab widget, positioned over the tab bar area
         self.new_tab_btn = QToolButton(self.tab_widget)
+        self.new_tab_btn.setObjectName("newTabBtn")  # styled by the main window QSS
         self.new_tab_btn.setText("+")
         self.new_tab_btn.setFixedWidth(28)
         self.new_tab_btn.setCursor(Qt.CursorShape.PointingHandCursor)
         self.new_tab_btn.clicked.connect(self.new_tab)
 
-        # Connect tab changes to update + button position
-        self.custom_tab_bar.tabInserted = self._wrap_tab_inserted(self.custom_tab_bar.tabInserted)
-        self.custom_tab_bar.tabRemoved = self._wrap_tab_removed(self.custom_tab_bar.tabRemoved)
+        # Reposition the + button after tab changes; queued so the tab bar has
+        # laid out the new tab first
+        self.custom_tab_bar.tabs_changed.connect(
+            self._update_new_tab_button_position, Qt.ConnectionType.QueuedConnection
+        )
 
         # Initial position update
         self._update_new_tab_button_position()
 
-    def _wrap_tab_inserted(self, original_func):
-        """Wrap tabInserted to update + button position."""
-
-        def wrapper(index):
-            original_func(index)
-            QTimer.singleShot(20, self._update_new_tab_button_position)
-
-        return wrapper
-
-    def _wrap_tab_removed(self, original_func):
-        """Wrap tabRemoved to update + button position."""
-
-        def wrapper(index):
-            original_func(index)
-            QTimer.singleShot(20, self._update_new_tab_button_position)
-
-        return wrapper
-
     def _update_new_tab_button_position(self):
         """Position the + button right after the last tab, flush with tab bar."""
         bar_height = self.custom_tab_bar.height()
@@ -207,14 +272,16 @@ class MainWindow(QMainWindow):
         # Activity bar (always visible on left edge)
         self.activity_bar = ActivityBar(self)
 
-        # Content panels
+        # Content panels — the file browser (and its file system model) is built
+        # the first time the Files panel is opened; until then a placeholder
+        # holds its slot in the stack
         self.side_panel = SidePanel(self)
-        self.file_browser = FileBrowserPanel(self)
+        self._file_browser: FileBrowserPanel | None = None
 
         # Stack for content (switches between AI and Files)
         self.panel_content = QStackedWidget()
         self.panel_content.addWidget(self.side_panel)  # Index 0: AI panel
-        self.panel_content.addWidget(self.file_browser)  # Index 1: File browser
+        self.panel_content.addWidget(QWidget())  # Index 1: File browser placeholder
 
         # Container with horizontal layout: [ActivityBar | ContentStack]
         panel_container = QWidget()
@@ -245,9 +312,6 @@ class MainWindow(QMainWindow):
         self.side_panel.chat_context_requested.connect(self._on_chat_context_requested)
         self.side_panel.replace_selection_requested.connect(self._replace_selection)
 
-        # Connect file browser signals
-        self.file_browser.file_selected.connect(self._open_file_path)
-
         # Track current active panel
         self._active_panel = "ai"
 
@@ -258,11 +322,26 @@ class MainWindow(QMainWindow):
         else:
             self._collapse_side_panel()
 
+    @property
+    def file_browser(self) -> FileBrowserPanel:
+        """The file browser panel, created on first access."""
+        if self._file_browser is None:
+            from ui.file_browser import FileBrowserPanel
+
+            self._file_browser = FileBrowserPanel(self)
+            self._file_browser.file_selected.connect(self._open_file_path)
+            placeholder = self.panel_content.widget(1)
+            self.panel_content.insertWidget(1, self._file_browser)
+            self.panel_content.removeWidget(placeholder)
+            placeholder.deleteLater()
+        return self._file_browser
+
     def _on_context_requested(self, prompt: str):
         """Handle AI prompt that needs editor context.
 
-        Gets selected text (or full file if no selection) from the current
-        editor and passes it to the side panel for AI generation.
+        Gets selected text (or the file, capped around the cursor, if no
+        selection) from the current editor and passes it to the side panel
+        for AI generation.
         """
         context = None
         is_selection = False
@@ -278,23 +357,23 @@ class MainWindow(QMainWindow):
                 context = selected_text.replace("\u2029", "\n")
                 is_selection = True
             else:
-                # No selection - use full file content
-                context = editor.toPlainText()
+                # No selection - use the file content
+                context = _editor_context(editor)
 
         self.side_panel.execute_prompt_with_context(prompt, context, is_selection)
 
     def _on_chat_context_requested(self, message: str):
         """Handle chat message that needs editor context.
 
-        Gets full file content from the current editor and passes it
-        to the side panel along with the user's message.
+        Gets the file content (capped around the cursor) from the current
+        editor and passes it to the side panel along with the user's message.
         """
         context = None
         editor = self.current_editor()
 
         if editor:
-            # For chat, always use full file content as context
-            context = editor.toPlainText()
+            # For chat, always use the file content as context
+            context = _editor_context(editor)
 
         self.side_panel.execute_chat_with_context(message, context)
 
@@ -325,19 +404,8 @@ class MainWindow(QMainWindow):
         editor.setPlainText(code)
 
         # Try to set language based on the code block language
-        language_map = {
-            "python": Language.PYTHON,
-            "py": Language.PYTHON,
-            "javascript": Language.JAVASCRIPT,
-            "js": Language.JAVASCRIPT,
-            "html": Language.HTML,
-            "css": Language.CSS,
-            "json": Language.JSON,
-            "markdown": Language.MARKDOWN,
-            "md": Language.MARKDOWN,
-        }
-        if language.lower() in language_map:
-            lang = language_map[language.lower()]
+        lang = _CODE_BLOCK_LANGUAGES.get(language.lower())
+        if lang is not None:
             editor.set_language(lang)
             self._status_bar_mgr.update_language(lang)
 
@@ -375,7 +443,7 @@ class MainWindow(QMainWindow):
 
         # Recent files submenu
         self.recent_menu = file_menu.addMenu(self.tr("Recent"))
-        self._update_recent_menu()
+        self._setup_recent_menu()
 
         file_menu.addSeparator()
 
@@ -464,7 +532,8 @@ class MainWindow(QMainWindow):
             action.setData(lang)
             action.triggered.connect(self._status_bar_mgr.on_language_selected)
             self.language_actions.addAction(action)
-            self.language_menu.addAction(action)
+        # Add to the menu in one call rather than one addAction per language
+        self.language_menu.addActions(self.language_actions.actions())
 
         view_menu.addSeparator()
 
@@ -542,7 +611,7 @@ class MainWindow(QMainWindow):
         if panel_id == "ai":
             self.panel_content.setCurrentIndex(0)
         elif panel_id == "files":
-            self.panel_content.setCurrentIndex(1)
+            self.panel_content.setCurrentWidget(self.file_browser)
 
         self._expand_side_panel()
         self.activity_bar.set_active(panel_id)
@@ -724,9 +793,8 @@ class MainWindow(QMainWindow):
     def _auto_save(self):
         """Auto-save all modified tabs that have a file path."""
         saved_count = 0
-        for i in range(self.tab_widget.count()):
-            editor = self.tab_widget.widget(i)
-            if isinstance(editor, EditorTab) and editor.filepath and editor.document().isModified():
+        for editor in self._editor_tabs:
+            if editor.filepath and editor.document().isModified():
                 error = editor.save_file()
                 if not error:
                     saved_count += 1
@@ -760,7 +828,9 @@ class MainWindow(QMainWindow):
             result = QMessageBox.warning(
                 self,
                 self.tr("Unsaved Changes"),
-                self.tr(f"You have unsaved changes in:\n\n{names}\n\nSave before closing?"),
+                self.tr("You have unsaved changes in:\n\n%1\n\nSave before closing?").replace(
+                    "%1", names
+                ),
                 QMessageBox.StandardButton.SaveAll
                 | QMessageBox.StandardButton.Discard
                 | QMessageBox.StandardButton.Cancel,
@@ -831,12 +901,14 @@ class MainWindow(QMainWindow):
             self._animate_tab_transition(editor)
 
     def _animate_tab_transition(self, editor: EditorTab):
-        """Apply a subtle fade-in animation when switching tabs."""
-        # Create opacity effect if not exists
-        effect = editor.graphicsEffect()
-        if not isinstance(effect, QGraphicsOpacityEffect):
-            effect = QGraphicsOpacityEffect(editor)
-            editor.setGraphicsEffect(effect)
+        """Apply a subtle fade-in animation when switching tabs (opt-in)."""
+        # An opacity effect renders the editor offscreen on every paint, so it
+        # is off by default and only attached for the length of the fade
+        if not self.settings_manager.get_tab_fade_enabled():
+            return
+
+        effect = QGraphicsOpacityEffect(editor)
+        editor.setGraphicsEffect(effect)
 
         # Create and start fade-in animation
         animation = QPropertyAnimation(effect, b"opacity", self)
@@ -844,11 +916,19 @@ class MainWindow(QMainWindow):
         animation.setStartValue(0.7)
         animation.setEndValue(1.0)
         animation.setEasingCurve(QEasingCurve.Type.OutCubic)
-        animation.start()
+        animation.finished.connect(lambda: self._end_tab_transition(editor, effect))
+        animation.start(QPropertyAnimation.DeletionPolicy.DeleteWhenStopped)
 
         # Store reference to prevent garbage collection
         self._tab_animation = animation
 
+    @staticmethod
+    def _end_tab_transition(editor: EditorTab, effect: QGraphicsOpacityEffect):
+        """Detach the fade effect so the editor paints directly again."""
+        # A quicker switch back to this tab may have installed a newer effect
+        if editor.graphicsEffect() is effect:
+            editor.setGraphicsEffect(None)
+
     # Status bar update methods moved to StatusBarManager
 
     def _load_layout_mode(self):
@@ -930,32 +1010,57 @@ class MainWindow(QMainWindow):
             return LayoutMode.CODING
         return LayoutMode.WRITING
 
+    def _setup_recent_menu(self):
+        """Create the recent files menu entries once; updates only relabel them."""
+        self._recent_actions: list[QAction] = []
+        for _ in range(RecentFilesManager.MAX_RECENT_FILES):
+            action = QAction(self)
+            action.setVisible(False)
+            action.triggered.connect(self._open_recent_file)
+            self._recent_actions.append(action)
+        self.recent_menu.addActions(self._recent_actions)
+
+        self._recent_separator = self.recent_menu.addSeparator()
+
+        self._clear_recent_action = QAction(self.tr("Clear Recent"), self)
+        self._clear_recent_action.triggered.connect(self._clear_recent_files)
+        self.recent_menu.addAction(self._clear_recent_action)
+
+        self._no_recent_action = QAction(self.tr("No recent files"), self)
+        self._no_recent_action.setEnabled(False)
+        self.recent_menu.addAction(self._no_recent_action)
+
+        # Entries are refreshed when the menu opens, not on every list change
+        self._recent_dirty = True
+        self.recent_menu.aboutToShow.connect(self._update_recent_menu)
+
+    def _mark_recent_menu_dirty(self):
+        """Flag the recent files menu for a refresh the next time it opens."""
+        self._recent_dirty = True
+
     def _update_recent_menu(self):
         """Update the recent files menu."""
-        self.recent_menu.clear()
+        if not self._recent_dirty:
+            return
+        self._recent_dirty = False
 
         files = self.recent_files.get_files()
-        if files:
-            for i, filepath in enumerate(files):
+        for i, action in enumerate(self._recent_actions):
+            if i < len(files):
+                filepath = files[i]
                 display_name = self.recent_files.get_display_name(filepath)
                 # Add number shortcut for first 9 files
                 if i < 9:
                     display_name = f"&{i + 1}  {display_name}"
-
-                action = QAction(display_name, self)
+                action.setText(display_name)
                 action.setData(filepath)
-                action.triggered.connect(self._open_recent_file)
-                self.recent_menu.addAction(action)
-
-            self.recent_menu.addSeparator()
+                action.setVisible(True)
+            else:
+                action.setVisible(False)
 
-            clear_action = QAction(self.tr("Clear Recent"), self)
-            clear_action.triggered.connect(self._clear_recent_files)
-            self.recent_menu.addAction(clear_action)
-        else:
-            no_recent = QAction(self.tr("No recent files"), self)
-            no_recent.setEnabled(False)
-            self.recent_menu.addAction(no_recent)
+        self._recent_separator.setVisible(bool(files))
+        self._clear_recent_action.setVisible(bool(files))
+        self._no_recent_action.setVisible(not files)
 
     def _open_recent_file(self):
         """Open a file from the recent files menu."""
@@ -970,7 +1075,7 @@ class MainWindow(QMainWindow):
                 QMessageBox.warning(
                     self,
                     self.tr("File Not Found"),
-                    self.tr(f"The file no longer exists:\n{filepath}"),
+                    self.tr("The file no longer exists:\n%1").replace("%1", filepath),
                 )
 
     def _clear_recent_files(self):
@@ -1004,7 +1109,9 @@ class MainWindow(QMainWindow):
         if error:
             # Close the tab we just created and show error
             idx = self.tab_widget.currentIndex()
+            self._disconnect_editor(editor)
             self.tab_widget.removeTab(idx)
+            self._editor_tabs.remove(editor)
             editor.deleteLater()
             QMessageBox.warning(self, self.tr("Open File"), error)
             return
@@ -1031,6 +1138,7 @@ class MainWindow(QMainWindow):
     def new_tab(self):
         """Create a new editor tab."""
         editor = EditorTab(parent=self.tab_widget)
+        self._editor_tabs.append(editor)
         index = self.tab_widget.addTab(editor, self.tr("Untitled"))
         self.tab_widget.setCurrentIndex(index)
         self._status_bar_mgr.connect_editor(editor)
@@ -1041,8 +1149,8 @@ class MainWindow(QMainWindow):
         if hasattr(self, "_inline_edit_ctrl"):
             self._inline_edit_ctrl.connect_editor(editor)
         # Track document modifications for unsaved indicator
-        editor.document().modificationChanged.connect(
-            lambda modified: self._on_document_modified(editor, modified)
+        self._modified_connections[editor] = editor.document().modificationChanged.connect(
+            functools.partial(self._on_document_modified, editor)
         )
         return editor
 
@@ -1058,6 +1166,16 @@ class MainWindow(QMainWindow):
         elif not modified and current_title.endswith("*"):
             self.tab_widget.setTabText(index, current_title[:-1])
 
+    def _disconnect_editor(self, editor: EditorTab):
+        """Undo the signal wiring done in new_tab before the editor is deleted."""
+        connection = self._modified_connections.pop(editor, None)
+        if connection is not None:
+            editor.document().modificationChanged.disconnect(connection)
+        if hasattr(self, "_completion_ctrl"):
+            self._completion_ctrl.disconnect_editor(editor)
+        if hasattr(self, "_inline_edit_ctrl"):
+            self._inline_edit_ctrl.disconnect_editor(editor)
+
     def _has_unsaved_changes(self, editor: EditorTab) -> bool:
         """Check if an editor has unsaved changes."""
         return editor.document().isModified()
@@ -1067,7 +1185,9 @@ class MainWindow(QMainWindow):
         result = QMessageBox.warning(
             self,
             self.tr("Unsaved Changes"),
-            self.tr(f"'{tab_name}' has unsaved changes.\n\nDo you want to save before closing?"),
+            self.tr("'%1' has unsaved changes.\n\nDo you want to save before closing?").replace(
+                "%1", tab_name
+            ),
             QMessageBox.StandardButton.Save
             | QMessageBox.StandardButton.Discard
             | QMessageBox.StandardButton.Cancel,
@@ -1101,7 +1221,9 @@ class MainWindow(QMainWindow):
             if not self._prompt_save_changes(editor, tab_name):
                 return  # User cancelled
 
+        self._disconnect_editor(editor)
         self.tab_widget.removeTab(index)
+        self._editor_tabs.remove(editor)
         editor.deleteLater()
 
         # Create new tab if all tabs closed
@@ -1119,9 +1241,8 @@ class MainWindow(QMainWindow):
             self,
             self.tr("Open File"),
             "",
-            self.tr(
-                "All Files (*);;Text Files (*.txt);;Python (*.py);;JavaScript (*.js);;HTML (*.html);;CSS (*.css);;JSON (*.json);;Markdown (*.md)"
-            ),
+            _FILE_FILTER,
+            options=self._FILE_DIALOG_OPTIONS,
         )
         if filepath:
             self._open_file_path(filepath)
@@ -1153,9 +1274,8 @@ class MainWindow(QMainWindow):
             self,
             self.tr("Save File"),
             "",
-            self.tr(
-                "All Files (*);;Text Files (*.txt);;Python (*.py);;JavaScript (*.js);;HTML (*.html);;CSS (*.css);;JSON (*.json);;Markdown (*.md)"
-            ),
+            _FILE_FILTER,
+            options=self._FILE_DIALOG_OPTIONS,
         )
         if filepath:
             error = editor.save_file(filepath)
@@ -1215,6 +1335,8 @@ class MainWindow(QMainWindow):
 
     def _show_settings(self):
         """Show the settings dialog."""
+        from ui.settings_dialog import SettingsDialog
+
         dialog = SettingsDialog(self)
         dialog.settings_changed.connect(self._apply_settings_to_editors)
         dialog.exec()
@@ -1341,10 +1463,23 @@ class MainWindow(QMainWindow):
         dlg_layout.addWidget(browser)
         dialog.exec()
 
+    def _appearance_key(self) -> tuple[str, str, int]:
+        """Return the settings that decide how the window is styled."""
+        sm = self.settings_manager
+        return sm.get_current_theme_name(), sm.get_font_family(), sm.get_font_size()
+
     def _apply_settings_to_editors(self):
         """Apply changed settings to all editor tabs and window chrome."""
-        self._theme_engine.apply_theme()
-        self._theme_engine.apply_child_themes()
+        # Restyle only for what changed: a theme change touches every widget,
+        # a font change only the editors, anything else neither
+        appearance = self._appearance_key()
+        if appearance[0] != self._applied_appearance[0]:
+            self._theme_engine.apply_theme()
+            self._theme_engine.apply_child_themes()
+        elif appearance != self._applied_appearance:
+            self._theme_engine.apply_editor_themes()
+        self._applied_appearance = appearance
+
         self._status_bar_mgr.update()
         self._start_auto_save_timer()
 
@@ -1355,41 +1490,11 @@ class MainWindow(QMainWindow):
     # Formatting - inserts markdown syntax for plain text
     def _toggle_bold(self):
         """Wrap selected text with bold markdown syntax (**)."""
-        editor = self.current_editor()
-        if not editor:
-            return
-
-        cursor = editor.textCursor()
-        selected_text = cursor.selectedText()
-
-        if selected_text:
-            # Wrap selection with **
-            cursor.insertText(f"**{selected_text}**")
-        else:
-            # Insert ** and place cursor in middle
-            pos = cursor.position()
-            cursor.insertText("****")
-            cursor.setPosition(pos + 2)
-            editor.setTextCursor(cursor)
+        self._wrap_selection(self._BOLD_MARKER, self._BOLD_MARKER)
 
     def _toggle_italic(self):
         """Wrap selected text with italic markdown syntax (*)."""
-        editor = self.current_editor()
-        if not editor:
-            return
-
-        cursor = editor.textCursor()
-        selected_text = cursor.selectedText()
-
-        if selected_text:
-            # Wrap selection with *
-            cursor.insertText(f"*{selected_text}*")
-        else:
-            # Insert ** and place cursor in middle
-            pos = cursor.position()
-            cursor.insertText("**")
-            cursor.setPosition(pos + 1)
-            editor.setTextCursor(cursor)
+        self._wrap_selection(self._ITALIC_MARKER, self._ITALIC_MARKER)
 
     def _insert_heading(self, level: int):
         """Insert markdown heading at cursor."""
@@ -1398,8 +1503,12 @@ class MainWindow(QMainWindow):
             return
 
         cursor = editor.textCursor()
-        cursor.movePosition(cursor.MoveOperation.StartOfBlock)
-        cursor.insertText("#" * level + " ")
+        cursor.beginEditBlock()
+        try:
+            cursor.movePosition(cursor.MoveOperation.StartOfBlock)
+            cursor.insertText(self._HEADING_PREFIXES[level])
+        finally:
+            cursor.endEditBlock()
         editor.setTextCursor(cursor)
 
     def _insert_list(self, list_type: str):
@@ -1410,43 +1519,59 @@ class MainWindow(QMainWindow):
 
         cursor = editor.textCursor()
         selected = cursor.selectedText()
-        marker = "- " if list_type == "bullet" else "1. "
 
-        if selected and "\u2029" in selected:
-            # Multi-line selection: prepend marker to each line
-            lines = selected.split("\u2029")
-            if list_type == "bullet":
-                new_text = "\n".join("- " + line for line in lines)
+        cursor.beginEditBlock()
+        try:
+            if selected and "\u2029" in selected:
+                # Multi-line selection: prepend marker to each line
+                lines = selected.split("\u2029")
+                if list_type == "bullet":
+                    new_text = "\n".join(self._BULLET_MARKER + line for line in lines)
+                else:
+                    new_text = "\n".join(f"{i}. {line}" for i, line in enumerate(lines, 1))
+                cursor.insertText(new_text)
             else:
-                new_text = "\n".join(f"{i}. {line}" for i, line in enumerate(lines, 1))
-            cursor.insertText(new_text)
-        else:
-            # Single line: move to start and insert marker
-            cursor.movePosition(cursor.MoveOperation.StartOfBlock)
-            cursor.insertText(marker)
+                # Single line: move to start and insert marker
+                cursor.movePosition(cursor.MoveOperation.StartOfBlock)
+                marker = self._BULLET_MARKER if list_type == "bullet" else self._NUMBER_MARKER
+                cursor.insertText(marker)
+        finally:
+            cursor.endEditBlock()
         editor.setTextCursor(cursor)
 
     def _insert_link(self):
         """Insert markdown link syntax."""
+        self._wrap_selection(*self._LINK_MARKERS, placeholder=self._LINK_PLACEHOLDER)
+
+    def _wrap_selection(self, before: str, after: str, placeholder: str = ""):
+        """Wrap the selection in markup, or insert it around a selected placeholder.
+
+        The whole insertion is one undo step. With no selection the caret
+        lands between the markers, selecting ``placeholder`` if given.
+        """
         editor = self.current_editor()
         if not editor:
             return
 
         cursor = editor.textCursor()
         selected = cursor.selectedText()
-        if selected:
-            cursor.insertText(f"[{selected}](url)")
-        else:
-            pos = cursor.position()
-            cursor.insertText("[text](url)")
-            cursor.setPosition(pos + 1)
-            cursor.setPosition(pos + 5, cursor.MoveMode.KeepAnchor)
-            editor.setTextCursor(cursor)
+
+        cursor.beginEditBlock()
+        try:
+            if selected:
+                cursor.insertText(f"{before}{selected}{after}")
+            else:
+                start = cursor.position() + len(before)
+                cursor.insertText(f"{before}{placeholder}{after}")
+                cursor.setPosition(start)
+                if placeholder:
+                    cursor.setPosition(start + len(placeholder), cursor.MoveMode.KeepAnchor)
+        finally:
+            cursor.endEditBlock()
+        editor.setTextCursor(cursor)
 
     def _clear_formatting(self):
         """Strip markdown formatting from selected text."""
-        import re
-
         editor = self.current_editor()
         if not editor:
             return
@@ -1458,13 +1583,12 @@ class MainWindow(QMainWindow):
 
         # Strip markdown syntax: bold, italic, headings, links, images
         cleaned = selected
-        cleaned = re.sub(r"\*\*(.+?)\*\*", r"\1", cleaned)  # **bold**
-        cleaned = re.sub(r"\*(.+?)\*", r"\1", cleaned)  # *italic*
-        cleaned = re.sub(r"^#{1,6}\s+", "", cleaned, flags=re.MULTILINE)  # headings
-        cleaned = re.sub(r"\[([^\]]+)\]\([^)]+\)", r"\1", cleaned)  # [text](url)
-        cleaned = re.sub(r"!\[([^\]]*)\]\([^)]+\)", r"\1", cleaned)  # ![alt](img)
-        cleaned = re.sub(r"~~(.+?)~~", r"\1", cleaned)  # ~~strikethrough~~
-        cleaned = re.sub(r"`(.+?)`", r"\1", cleaned)  # `inline code`
+        for pattern, replacement in _MARKDOWN_STRIP_PATTERNS:
+            cleaned = pattern.sub(replacement, cleaned)
 
         if cleaned != selected:
-            cursor.insertText(cleaned)
+            cursor.beginEditBlock()
+            try:
+                cursor.insertText(cleaned)
+            finally:
+                cursor.endEditBlock()
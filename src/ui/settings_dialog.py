@@ -118,6 +118,9 @@ class SettingsDialog(QDialog):
         self.theme_combo.currentTextChanged.connect(self._on_settings_changed)
         theme_layout.addRow("Color theme:", self.theme_combo)
 
+        self.tab_fade_checkbox = QCheckBox("Fade in when switching tabs")
+        theme_layout.addRow(self.tab_fade_checkbox)
+
         layout.addWidget(theme_group)
 
         # Font group
@@ -388,6 +391,7 @@ class SettingsDialog(QDialog):
         index = self.theme_combo.findText(current_theme)
         if index >= 0:
             self.theme_combo.setCurrentIndex(index)
+        self.tab_fade_checkbox.setChecked(self.settings.get_tab_fade_enabled())
 
         # Font family
         font_family = self.settings.get_font_family()
@@ -478,6 +482,7 @@ class SettingsDialog(QDialog):
     def _apply_settings(self):
         """Apply settings without closing."""
         self.settings.set_current_theme(self.theme_combo.currentText())
+        self.settings.set_tab_fade_enabled(self.tab_fade_checkbox.isChecked())
         self.settings.set_font_family(self.font_combo.currentText())
 
         try:
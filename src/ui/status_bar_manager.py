@@ -2,10 +2,9 @@
 Status bar manager — creates and updates all status bar indicators.
 """
 
-import contextlib
 from collections.abc import Callable
 
-from PyQt6.QtGui import QActionGroup
+from PyQt6.QtGui import QAction, QActionGroup
 from PyQt6.QtWidgets import QLabel, QMainWindow, QStatusBar
 
 from syntax.highlighter import Language
@@ -27,6 +26,8 @@ class StatusBarManager:
         self._window = window
         self._get_editor = get_editor
         self._language_actions: QActionGroup | None = None
+        self._language_to_action: dict[Language, QAction] = {}
+        self._wired_editor: EditorTab | None = None
 
         # Labels — created in setup()
         self.statusbar: QStatusBar | None = None
@@ -40,6 +41,7 @@ class StatusBarManager:
     def set_language_actions(self, language_actions: QActionGroup) -> None:
         """Set the language action group (created during menu setup)."""
         self._language_actions = language_actions
+        self._language_to_action = {action.data(): action for action in language_actions.actions()}
 
     def setup(self) -> QStatusBar:
         """Create the status bar with all indicators.
@@ -73,45 +75,77 @@ class StatusBarManager:
     def connect_editor(self, editor: EditorTab) -> None:
         """Connect editor signals for status bar updates.
 
-        Safely disconnects any previous connections first.
+        Only the previously wired editor is disconnected, so re-wiring the
+        same editor (tab switch followed by new_tab) is a no-op.
         """
-        with contextlib.suppress(TypeError):
-            editor.cursorPositionChanged.disconnect(self.update)
-        with contextlib.suppress(TypeError):
-            editor.textChanged.disconnect(self.update)
+        if editor is self._wired_editor:
+            return
 
-        editor.cursorPositionChanged.connect(self.update)
-        editor.textChanged.connect(self.update)
+        previous = self._wired_editor
+        if previous is not None:
+            previous.cursorPositionChanged.disconnect(self.update_position)
+            previous.textChanged.disconnect(self.update_text_stats)
+            previous.destroyed.disconnect(self._forget_editor)
+
+        # Cursor moves only change the position label; edits change the counts
+        editor.cursorPositionChanged.connect(self.update_position)
+        editor.textChanged.connect(self.update_text_stats)
+        # A closed tab's editor is deleted; never disconnect from a dead object
+        editor.destroyed.connect(self._forget_editor)
+        self._wired_editor = editor
         self.update()
 
+    def _forget_editor(self) -> None:
+        """Drop the wired editor reference once it has been deleted."""
+        self._wired_editor = None
+
     def update(self) -> None:
         """Update all status bar indicators from the current editor."""
         editor = self._get_editor()
         if not editor:
             return
 
-        # Position
+        self._show_position(editor)
+        self._show_text_stats(editor)
+
+        # Zoom level
+        zoom = 100 + (editor._zoom_level * 10)
+        self.zoom_label.setText(f"{zoom}%")
+
+    def update_position(self) -> None:
+        """Update the line/column indicator (runs on every cursor move)."""
+        if editor := self._get_editor():
+            self._show_position(editor)
+
+    def update_text_stats(self) -> None:
+        """Update the character count and line ending (runs on every edit)."""
+        if editor := self._get_editor():
+            self._show_text_stats(editor)
+
+    def _show_position(self, editor: EditorTab) -> None:
+        """Set the position label from the editor's cursor."""
         cursor = editor.textCursor()
         line = cursor.blockNumber() + 1
         col = cursor.columnNumber() + 1
         self.position_label.setText(f"Ln {line}, Col {col}")
 
-        # Character count
-        text = editor.toPlainText()
-        char_count = len(text)
+    def _show_text_stats(self, editor: EditorTab) -> None:
+        """Set the character count and line ending labels from the document."""
+        # Character count — characterCount() is O(1) and includes the
+        # document's trailing paragraph separator; toPlainText() would copy
+        # the whole document on every keystroke. It counts UTF-16 units, the
+        # same unit as cursor positions, so a character outside the BMP
+        # (most emoji) counts as two.
+        doc = editor.document()
+        char_count = doc.characterCount() - 1
         if char_count == 1:
             self.chars_label.setText("1 character")
         else:
             self.chars_label.setText(f"{char_count:,} characters")
 
-        # Zoom level
-        zoom = 100 + (editor._zoom_level * 10)
-        self.zoom_label.setText(f"{zoom}%")
-
-        # Line ending detection
-        if "\r\n" in text:
-            self.line_ending_label.setText("CRLF")
-        elif "\n" in text:
+        # Line ending detection — the document stores lines as blocks (files are
+        # read with universal newlines), so any line break shows as LF
+        if doc.blockCount() > 1:
             self.line_ending_label.setText("LF")
         else:
             self.line_ending_label.setText("CRLF")  # Default for Windows
@@ -120,10 +154,8 @@ class StatusBarManager:
         """Update the language indicator label and menu checkmark."""
         self.language_label.setText(language.name.capitalize())
 
-        for action in self._language_actions.actions():
-            if action.data() == language:
-                action.setChecked(True)
-                break
+        if action := self._language_to_action.get(language):
+            action.setChecked(True)
 
     def on_language_selected(self) -> None:
         """Handle language selection from the View > Language menu."""
@@ -42,6 +42,9 @@ class TitleBarController:
         "bottom_left": Qt.CursorShape.SizeBDiagCursor,
     }
 
+    # App icon shared by every window — decoding the .ico is not free
+    _app_icon: QIcon | None = None
+
     def __init__(self, window: QMainWindow) -> None:
         self._win = window
 
@@ -69,9 +72,9 @@ class TitleBarController:
         self._enable_native_snapping()
 
         # Set taskbar icon
-        icon_path = self._get_resource_path("mynotion.ico")
-        if icon_path.exists():
-            self._win.setWindowIcon(QIcon(str(icon_path)))
+        icon = self._get_app_icon()
+        if not icon.isNull():
+            self._win.setWindowIcon(icon)
 
     def create_title_bar(self, header_vlayout: QVBoxLayout) -> None:
         """Build the custom title bar row and add it to *header_vlayout*."""
@@ -85,9 +88,8 @@ class TitleBarController:
         self._title_icon_label = QLabel()
         self._title_icon_label.setFixedSize(16, 16)
         self._title_icon_label.setAttribute(Qt.WidgetAttribute.WA_TransparentForMouseEvents)
-        icon_path = self._get_resource_path("mynotion.ico")
-        if icon_path.exists():
-            icon = QIcon(str(icon_path))
+        icon = self._get_app_icon()
+        if not icon.isNull():
             self._title_icon_label.setPixmap(icon.pixmap(16, 16))
         tb_layout.addWidget(self._title_icon_label)
 
@@ -340,6 +342,14 @@ class TitleBarController:
         except Exception:
             pass
 
+    @classmethod
+    def _get_app_icon(cls) -> QIcon:
+        """Return the app icon, loading it on first use (null if the file is missing)."""
+        if cls._app_icon is None:
+            icon_path = cls._get_resource_path("mynotion.ico")
+            cls._app_icon = QIcon(str(icon_path)) if icon_path.exists() else QIcon()
+        return cls._app_icon
+
     @staticmethod
     def _get_resource_path(filename: str) -> Path:
         """Get path to a resource file, supporting both dev and PyInstaller."""
@@ -145,14 +145,6 @@ class FormattingToolbar(QWidget):
             }}
         """
 
-        for btn in [
-            self.headings_btn,
-            self.bold_btn,
-            self.italic_btn,
-            self.clear_btn,
-        ]:
-            btn.setStyleSheet(button_style)
-
-        # Style the menus
-        if self.headings_btn.menu():
-            self.headings_btn.menu().setStyleSheet(menu_style)
+        # One sheet on the toolbar cascades to its buttons and the headings
+        # menu (parented here), so a theme change is a single QSS parse
+        self.setStyleSheet(button_style + menu_style)
@@ -237,6 +237,11 @@ def isolated_settings(tmp_path, monkeypatch):
         str(tmp_path / "settings"),
     )
 
+    # Drop the theme name SettingsManager caches across instances
+    from core.settings import SettingsManager
+
+    monkeypatch.setattr(SettingsManager, "_theme_name", None)
+
 
 # ---------------------------------------------------------------------------
 # Widget helpers — common patterns for UI testing with qtbot
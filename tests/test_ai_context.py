@@ -142,6 +142,46 @@ class TestMainWindowContext:
         # No selection — toPlainText gives full file
         assert tab.toPlainText() == content
 
+    def test_small_file_context_is_whole_document(self, create_editor_tab, qtbot):
+        """Files under the cap should be sent in full."""
+        from ui.main_window import _editor_context
+
+        content = "def foo():\n    return 42\n"
+        tab = create_editor_tab(content=content)
+        qtbot.addWidget(tab)
+
+        assert _editor_context(tab) == content
+
+    def test_large_file_context_is_capped_around_cursor(self, create_editor_tab, qtbot):
+        """Large files should only send a window of text around the cursor."""
+        from ui.main_window import _MAX_CONTEXT_CHARS, _editor_context
+
+        lines = [f"line {i:06d}" for i in range(20_000)]
+        tab = create_editor_tab(content="\n".join(lines))
+        qtbot.addWidget(tab)
+        cursor = tab.textCursor()
+        cursor.setPosition(tab.document().findBlockByNumber(10_000).position())
+        tab.setTextCursor(cursor)
+
+        with patch.object(tab, "toPlainText") as to_plain_text:
+            context = _editor_context(tab)
+
+        to_plain_text.assert_not_called()
+        assert len(context) == _MAX_CONTEXT_CHARS
+        assert "line 010000" in context
+        assert "line 000000" not in context
+        assert "\u2029" not in context
+
+    def test_large_file_context_at_end_is_full_window(self, create_editor_tab, qtbot):
+        """A cursor near the end should still yield a full-size window."""
+        from ui.main_window import _MAX_CONTEXT_CHARS, _editor_context
+
+        tab = create_editor_tab(content="x" * (_MAX_CONTEXT_CHARS * 2))
+        qtbot.addWidget(tab)
+        tab.moveCursor(tab.textCursor().MoveOperation.End)
+
+        assert _editor_context(tab) == "x" * _MAX_CONTEXT_CHARS
+
 
 # ---------------------------------------------------------------------------
 # execute_chat_with_context
@@ -40,6 +40,22 @@ class TestEditorTab:
         assert "sample content" in tab.toPlainText()
         assert tab.filepath == str(tmp_file)
 
+    def test_load_file_larger_than_read_chunk(self, create_editor_tab, qtbot, tmp_path):
+        """Files spanning several read chunks load intact and without undo history."""
+        from ui.editor_tab import _READ_CHUNK_SIZE
+
+        content = "\n".join(f"line {i}" for i in range(_READ_CHUNK_SIZE // 4))
+        path = tmp_path / "big.txt"
+        path.write_text(content, encoding="utf-8")
+        tab = create_editor_tab(content="old text")
+        qtbot.addWidget(tab)
+
+        assert tab.load_file(str(path)) is None
+
+        assert tab.toPlainText() == content
+        assert not tab.document().isUndoAvailable()
+        assert tab.textCursor().position() == 0
+
     def test_load_python_file_sets_language(self, create_editor_tab, qtbot, tmp_python_file):
         """Test that loading a .py file sets Python language."""
         tab = create_editor_tab()
@@ -51,6 +67,27 @@ class TestEditorTab:
 
         assert tab.language == Language.PYTHON
 
+    def test_empty_font_family_uses_cached_fixed_font(self, create_editor_tab, qtbot):
+        """With no configured family, the editor falls back to the system fixed font."""
+        from core.settings import SettingsManager
+        from ui.editor_tab import _default_fixed_font
+
+        SettingsManager().set_font_family("")
+        tab = create_editor_tab()
+        qtbot.addWidget(tab)
+
+        assert tab.font().family() == _default_fixed_font().family()
+        assert tab.font().pointSize() == SettingsManager().get_font_size()
+
+    def test_tab_stop_follows_font(self, create_editor_tab, qtbot):
+        """Tab stops stay four spaces wide after zooming."""
+        tab = create_editor_tab()
+        qtbot.addWidget(tab)
+
+        tab.zoom_in()
+
+        assert tab.tabStopDistance() == tab.fontMetrics().horizontalAdvance(" ") * 4
+
     def test_zoom_in(self, create_editor_tab, qtbot):
         """Test zoom in increases zoom level."""
         tab = create_editor_tab()
@@ -71,6 +108,17 @@ class TestEditorTab:
 
         assert tab._zoom_level == initial_zoom - 1
 
+    def test_line_number_width_grows_with_digits(self, create_editor_tab, qtbot):
+        """Line number gutter should widen by one digit per power of ten."""
+        tab = create_editor_tab(content="x")
+        qtbot.addWidget(tab)
+        narrow = tab.line_number_area_width()
+
+        tab.setPlainText("\n".join("x" * 100))
+
+        digit = tab.fontMetrics().horizontalAdvance("9")
+        assert tab.line_number_area_width() == narrow + 2 * digit
+
 
 class TestEditorTabSave:
     """Tests for EditorTab save functionality."""
@@ -86,6 +134,84 @@ class TestEditorTabSave:
         assert save_path.exists()
         assert save_path.read_text() == "Test content to save"
 
+    def test_save_multiline_roundtrip(self, create_editor_tab, qtbot, tmp_path):
+        """Saving writes every block and leaves no temp files behind."""
+        tab = create_editor_tab(content="one\ntwo\n\nfour")
+        qtbot.addWidget(tab)
+
+        save_path = tmp_path / "multi.txt"
+        assert tab.save_file(str(save_path)) is None
+
+        assert save_path.read_text(encoding="utf-8") == "one\ntwo\n\nfour"
+        assert [p.name for p in tmp_path.iterdir() if p.is_file()] == ["multi.txt"]
+
+    def test_save_overwrites_existing_file(self, create_editor_tab, qtbot, tmp_path):
+        """Saving over an existing file replaces its content."""
+        save_path = tmp_path / "existing.txt"
+        save_path.write_text("old content that is longer", encoding="utf-8")
+        tab = create_editor_tab(content="new")
+        qtbot.addWidget(tab)
+
+        assert tab.save_file(str(save_path)) is None
+
+        assert save_path.read_text(encoding="utf-8") == "new"
+
+    def test_save_maps_line_separators_like_plain_text(self, create_editor_tab, qtbot, tmp_path):
+        """In-block U+2028 and no-break spaces are saved as toPlainText() returns them."""
+        tab = create_editor_tab(content="a\u2028b\u00a0c")
+        qtbot.addWidget(tab)
+
+        save_path = tmp_path / "separators.txt"
+        assert tab.save_file(str(save_path)) is None
+
+        assert save_path.read_text(encoding="utf-8") == tab.toPlainText()
+
+    def test_save_through_symlink_keeps_link(self, create_editor_tab, qtbot, tmp_path):
+        """Saving via a symlink should update the target and leave the link in place."""
+        target = tmp_path / "target.txt"
+        target.write_text("old", encoding="utf-8")
+        link = tmp_path / "link.txt"
+        link.symlink_to(target)
+        tab = create_editor_tab(content="new")
+        qtbot.addWidget(tab)
+
+        assert tab.save_file(str(link)) is None
+
+        assert link.is_symlink()
+        assert target.read_text(encoding="utf-8") == "new"
+
+    def test_save_keeps_hard_links(self, create_editor_tab, qtbot, tmp_path):
+        """A hard-linked file should be rewritten in place so every link sees the save."""
+        import os
+
+        original = tmp_path / "original.txt"
+        original.write_text("old", encoding="utf-8")
+        other = tmp_path / "other.txt"
+        os.link(original, other)
+        tab = create_editor_tab(content="new")
+        qtbot.addWidget(tab)
+
+        assert tab.save_file(str(original)) is None
+
+        assert other.read_text(encoding="utf-8") == "new"
+        assert original.stat().st_ino == other.stat().st_ino
+
+    def test_save_new_file_uses_umask_mode(self, create_editor_tab, qtbot, tmp_path):
+        """New files should get 0666 minus the umask, not the temp file's 0600."""
+        import os
+        import stat
+
+        tab = create_editor_tab(content="x")
+        qtbot.addWidget(tab)
+        mask = os.umask(0o022)
+        try:
+            save_path = tmp_path / "fresh.txt"
+            assert tab.save_file(str(save_path)) is None
+        finally:
+            os.umask(mask)
+
+        assert stat.S_IMODE(save_path.stat().st_mode) == 0o644
+
     def test_save_updates_filepath(self, create_editor_tab, qtbot, tmp_path):
         """Test that save updates the filepath."""
         tab = create_editor_tab(content="Content")
@@ -109,6 +235,29 @@ class TestEditorTabLanguage:
         tab.set_language(Language.PYTHON)
         assert tab.language == Language.PYTHON
 
+    def test_set_language_detaches_previous_highlighter(self, create_editor_tab, qtbot):
+        """Only the newest highlighter should stay attached to the document."""
+        from syntax.highlighter import Language
+
+        tab = create_editor_tab()
+        qtbot.addWidget(tab)
+        old = tab._highlighter
+        tab.set_language(Language.PYTHON)
+
+        assert old.document() is None
+        assert tab._highlighter.document() is tab.document()
+
+    def test_load_file_attaches_highlighter_after_text(
+        self, create_editor_tab, qtbot, tmp_python_file
+    ):
+        """Loading a file should leave a highlighter attached to the document."""
+        tab = create_editor_tab()
+        qtbot.addWidget(tab)
+
+        tab.load_file(str(tmp_python_file))
+
+        assert tab._highlighter.document() is tab.document()
+
     def test_language_detection_python(self):
         from syntax.highlighter import Language, get_language_from_extension
 
@@ -147,3 +296,88 @@ class TestEditorTabLanguage:
 
         assert get_language_from_extension("file.xyz") == Language.PLAIN
         assert get_language_from_extension("") == Language.PLAIN
+
+
+class TestEditorTabGhostText:
+    """Tests for ghost text (inline completion) state."""
+
+    def test_set_ghost_text_caches_offset(self, create_editor_tab, qtbot):
+        """Ghost x offset should be computed once when ghost text is set."""
+        tab = create_editor_tab(content="abc")
+        qtbot.addWidget(tab)
+        cursor = tab.textCursor()
+        cursor.movePosition(cursor.MoveOperation.End)
+        tab.setTextCursor(cursor)
+
+        tab.set_ghost_text("def")
+
+        margin = int(tab.document().documentMargin())
+        assert tab._ghost_x_offset == tab.fontMetrics().horizontalAdvance("abc") + margin
+        assert tab._ghost_line_height > 0
+
+    def test_zoom_refreshes_ghost_line_height(self, create_editor_tab, qtbot):
+        """The cached ghost line height should follow the font through a zoom."""
+        tab = create_editor_tab(content="abc")
+        qtbot.addWidget(tab)
+        tab.set_ghost_text("one\ntwo")
+        before = tab._ghost_line_height
+
+        tab.zoom_in()
+        tab.zoom_in()
+
+        assert tab._ghost_line_height == tab.fontMetrics().lineSpacing()
+        assert tab._ghost_line_height > before
+
+    def test_set_ghost_text_splits_lines_once(self, create_editor_tab, qtbot):
+        """Ghost text lines are split when set and reused for painting/accepting."""
+        tab = create_editor_tab()
+        qtbot.addWidget(tab)
+
+        tab.set_ghost_text("first\nsecond")
+        assert tab._ghost_lines == ["first", "second"]
+
+        tab._accept_ghost_text(first_line_only=True)
+        assert tab.toPlainText() == "first"
+        assert tab._ghost_lines == []
+
+    def test_clear_ghost_text_resets_cache(self, create_editor_tab, qtbot):
+        """Clearing ghost text should reset the cached geometry."""
+        tab = create_editor_tab(content="abc")
+        qtbot.addWidget(tab)
+        tab.set_ghost_text("def")
+
+        tab.clear_ghost_text()
+
+        assert not tab.has_ghost_text()
+        assert tab._ghost_x_offset == 0
+
+    def test_request_completion_skips_unchanged_position(self, create_editor_tab, qtbot):
+        """A second completion request at the same revision/position is a no-op."""
+        tab = create_editor_tab(content="def foo():")
+        qtbot.addWidget(tab)
+        tab.set_completion_enabled(True)
+        cursor = tab.textCursor()
+        cursor.movePosition(cursor.MoveOperation.End)
+        tab.setTextCursor(cursor)
+        emitted = []
+        tab.completion_requested.connect(lambda p, s: emitted.append((p, s)))
+
+        tab._request_completion()
+        tab._request_completion()
+
+        assert emitted == [("def foo():", "")]
+
+    def test_local_context_matches_extract_context(self, create_editor_tab, qtbot):
+        """Block-walking context should equal extract_context on the full text."""
+        from ai.completion import extract_context
+
+        text = "\n".join(f"line {i} = {i}" for i in range(300))
+        tab = create_editor_tab(content=text)
+        qtbot.addWidget(tab)
+        cursor = tab.textCursor()
+        cursor.setPosition(tab.document().findBlockByNumber(150).position() + 4)
+
+        assert tab._local_context(cursor) == extract_context(text, 150, 4)
+
+        cursor.setPosition(2)
+        assert tab._local_context(cursor) == extract_context(text, 0, 2)
@@ -81,7 +81,7 @@ class TestFileBrowserRootPath:
         browser.set_root_path(str(tmp_project_dir))
 
         expected_index = browser.model.index(browser.model.rootPath())
-        actual_index = browser.tree_view.rootIndex()
+        actual_index = browser.proxy_model.mapToSource(browser.tree_view.rootIndex())
         # Both should point to the same path
         assert browser.model.filePath(actual_index) == browser.model.filePath(expected_index)
 
@@ -160,6 +160,47 @@ class TestFileBrowserSignals:
         assert signal_fired == []
 
 
+# ---------------------------------------------------------------------------
+# Directory pruning
+# ---------------------------------------------------------------------------
+
+
+class TestFileBrowserPruning:
+    """Tests for hiding heavy directories via the proxy model."""
+
+    def _visible_names(self, browser, qtbot):
+        proxy = browser.proxy_model
+        qtbot.waitUntil(lambda: proxy.rowCount(browser.tree_view.rootIndex()) > 0, timeout=2000)
+        qtbot.wait(100)  # let the directory listing finish
+        root = browser.tree_view.rootIndex()
+        return {
+            browser.proxy_model.index(row, 0, root).data()
+            for row in range(browser.proxy_model.rowCount(root))
+        }
+
+    def test_heavy_directories_hidden(self, browser, tmp_project_dir, qtbot):
+        """Directories like .git and node_modules should not appear in the tree."""
+        (tmp_project_dir / ".git").mkdir()
+        (tmp_project_dir / "node_modules").mkdir()
+        browser.set_root_path(str(tmp_project_dir))
+
+        names = self._visible_names(browser, qtbot)
+
+        assert "src" in names
+        assert ".git" not in names
+        assert "node_modules" not in names
+
+    def test_pruned_name_as_root_still_shown(self, browser, tmp_path, qtbot):
+        """A project root whose own name is pruned should still list its contents."""
+        root = tmp_path / "build"
+        root.mkdir()
+        (root / "output.txt").write_text("x", encoding="utf-8")
+        browser.set_root_path(str(root))
+
+        assert browser.tree_view.rootIndex().isValid()
+        assert "output.txt" in self._visible_names(browser, qtbot)
+
+
 # ---------------------------------------------------------------------------
 # Theme
 # ---------------------------------------------------------------------------
@@ -176,3 +217,29 @@ class TestFileBrowserTheme:
         """After apply_theme, widget should have a stylesheet."""
         browser.apply_theme()
         assert browser.styleSheet() != ""
+
+    def test_apply_theme_reuses_cached_stylesheets(self, browser):
+        """Re-applying the same theme should reuse the cached stylesheet strings."""
+        from unittest.mock import patch
+
+        first = browser.tree_view.styleSheet()
+        with patch("ui.file_browser._build_stylesheets") as build:
+            browser.apply_theme()
+        build.assert_not_called()
+        assert browser.tree_view.styleSheet() == first
+
+    def test_rebuilding_stylesheets_hits_color_cache(self, browser):
+        """A second build for the same theme should take every rgba() from the cache."""
+        from core.settings import SettingsManager
+        from ui.file_browser import _build_stylesheets
+        from ui.theme_engine import hex_to_rgba
+
+        theme = SettingsManager().get_current_theme()
+        _build_stylesheets(theme)
+        before = hex_to_rgba.cache_info()
+
+        _build_stylesheets(theme)
+
+        after = hex_to_rgba.cache_info()
+        assert after.misses == before.misses
+        assert after.hits > before.hits
@@ -2,9 +2,12 @@
 # tests/test_find_replace.py — Tests for FindReplaceBar
 # =============================================================================
 
+from unittest.mock import patch
+
 import pytest
 from PyQt6.QtWidgets import QPlainTextEdit
 
+from core.settings import THEMES
 from ui.find_replace import FindReplaceBar
 
 # ---------------------------------------------------------------------------
@@ -166,6 +169,50 @@ class TestFindReplaceBarFind:
         assert cursor.hasSelection()
         assert cursor.selectedText() == "baz"
 
+    def test_find_next_steps_through_matches(self, find_bar, editor):
+        """Repeated find_next should visit each match in order, then wrap."""
+        find_bar.find_input.setText("hello")
+        starts = []
+        for _ in range(4):
+            find_bar.find_next()
+            starts.append(editor.textCursor().selectionStart())
+
+        assert starts == [0, 12, 24, 0]
+
+    def test_find_next_reuses_match_positions(self, find_bar, editor):
+        """Navigation should scan the document once per revision and query."""
+        find_bar.find_input.setText("hello")
+        find_bar.find_next()
+        cache = find_bar._match_cache
+        find_bar.find_next()
+        find_bar.find_prev()
+        assert find_bar._match_cache is cache
+
+        editor.insertPlainText("x")
+        find_bar.find_next()
+        assert find_bar._match_cache is not cache
+
+    def test_find_next_after_astral_characters(self, find_bar, editor):
+        """Match positions should account for characters outside the BMP."""
+        editor.setPlainText("\U0001f600 hello \U0001f600 hello")
+        find_bar.find_input.setText("hello")
+        find_bar.find_next()
+        find_bar.find_next()
+
+        assert editor.textCursor().selectedText() == "hello"
+        assert editor.textCursor().selectionStart() == 12
+
+    def test_find_no_match_keeps_cursor(self, find_bar, editor):
+        """A query with no matches should leave the cursor where it was."""
+        cursor = editor.textCursor()
+        cursor.setPosition(5)
+        editor.setTextCursor(cursor)
+
+        find_bar.find_input.setText("missing")
+        find_bar.find_next()
+
+        assert editor.textCursor().position() == 5
+
     def test_find_empty_string_does_nothing(self, find_bar, editor):
         """Empty search should not move cursor."""
         cursor = editor.textCursor()
@@ -192,28 +239,117 @@ class TestFindReplaceBarFind:
 class TestFindReplaceBarMatchCount:
     """Tests for match counting."""
 
-    def test_match_count_updates(self, find_bar):
+    def test_match_count_updates(self, find_bar, qtbot):
         """Typing in find input should update match count."""
         find_bar.find_input.setText("hello")
         # "Hello", "hello", "HELLO" — 3 case-insensitive matches
-        assert "3 found" in find_bar.match_label.text()
+        qtbot.waitUntil(lambda: "3 found" in find_bar.match_label.text(), timeout=1000)
 
-    def test_match_count_case_sensitive(self, find_bar):
+    def test_match_count_case_sensitive(self, find_bar, qtbot):
         """Case-sensitive search should count exact matches only."""
         find_bar.case_checkbox.setChecked(True)
         find_bar.find_input.setText("hello")
-        assert "1 found" in find_bar.match_label.text()
+        qtbot.waitUntil(lambda: "1 found" in find_bar.match_label.text(), timeout=1000)
 
-    def test_no_results_message(self, find_bar):
+    def test_no_results_message(self, find_bar, qtbot):
         """Search with no matches should show 'No results'."""
         find_bar.find_input.setText("zzzznotfound")
-        assert "No results" in find_bar.match_label.text()
+        qtbot.waitUntil(lambda: "No results" in find_bar.match_label.text(), timeout=1000)
+
+    def test_special_characters_matched_literally(self, find_bar, editor, qtbot):
+        """Regex metacharacters in the query should match literally."""
+        editor.setPlainText("a.b axb a.b")
+        find_bar.find_input.setText("a.b")
+        qtbot.waitUntil(lambda: "2 found" in find_bar.match_label.text(), timeout=1000)
+
+    def test_typing_burst_counts_once(self, find_bar, qtbot, monkeypatch):
+        """Several quick edits to the query should trigger a single scan."""
+        calls = []
+        monkeypatch.setattr(find_bar, "_highlight_all_matches", lambda: calls.append(1))
+        find_bar._search_timer.timeout.disconnect()
+        find_bar._search_timer.timeout.connect(find_bar._highlight_all_matches)
+
+        for partial in ("h", "he", "hel", "hell", "hello"):
+            find_bar.find_input.setText(partial)
+
+        qtbot.waitUntil(lambda: calls == [1], timeout=1000)
+        qtbot.wait(200)
+        assert calls == [1]
+
+    def test_pattern_reused_for_same_query(self, find_bar):
+        """The compiled pattern is only rebuilt when the query or case option changes."""
+        flags = find_bar._get_find_flags()
+        first = find_bar._get_pattern("hello", flags)
+        assert find_bar._get_pattern("hello", flags) is first
+
+        find_bar.case_checkbox.setChecked(True)
+        assert find_bar._get_pattern("hello", find_bar._get_find_flags()) is not first
+
+    def test_query_escaped_once_per_change(self, find_bar):
+        """The escaped query is computed when the input changes and then reused."""
+        find_bar.find_input.setText("a.b(c)")
+        assert find_bar._search_escaped == ("a.b(c)", r"a\.b\(c\)")
+
+        with patch("ui.find_replace.re.escape") as escape:
+            assert find_bar._escaped("a.b(c)") == r"a\.b\(c\)"
+            find_bar._get_pattern("a.b(c)", find_bar._get_find_flags())
+        escape.assert_not_called()
 
-    def test_empty_search_clears_label(self, find_bar):
+    def test_match_count_capped(self, find_bar, editor, qtbot):
+        """Counting stops at MATCH_COUNT_LIMIT and the label shows a '+'."""
+        from ui.find_replace import MATCH_COUNT_LIMIT
+
+        editor.setPlainText("x " * (MATCH_COUNT_LIMIT + 50))
+        find_bar.find_input.setText("x")
+        qtbot.waitUntil(
+            lambda: find_bar.match_label.text() == f"{MATCH_COUNT_LIMIT}+ found", timeout=2000
+        )
+
+    def test_match_count_capped_case_sensitive(self, find_bar, editor, qtbot):
+        """The case-sensitive str.count path is capped the same way."""
+        from ui.find_replace import MATCH_COUNT_LIMIT
+
+        editor.setPlainText("x " * (MATCH_COUNT_LIMIT + 50))
+        find_bar.case_checkbox.setChecked(True)
+        find_bar.find_input.setText("x")
+        qtbot.waitUntil(
+            lambda: find_bar.match_label.text() == f"{MATCH_COUNT_LIMIT}+ found", timeout=2000
+        )
+
+    def test_flat_text_cached_until_edit(self, find_bar, editor):
+        """The plain-text snapshot is reused until the document changes."""
+        first = find_bar._flat_text()
+        assert find_bar._flat_text() is first
+
+        editor.insertPlainText("more")
+        assert find_bar._flat_text() is not first
+        assert "more" in find_bar._flat_text()
+
+    def test_lowercase_text_cached_until_edit(self, find_bar, editor):
+        """The lowercased snapshot is built once per document revision."""
+        first = find_bar._flat_lower()
+        assert first == editor.toPlainText().lower()
+        assert find_bar._flat_lower() is first
+
+        editor.insertPlainText("MORE")
+        assert find_bar._flat_lower() is not first
+        assert "more" in find_bar._flat_lower()
+
+    def test_count_shown_without_waiting(self, find_bar):
+        """The debounced count runs in place, so the label is set when it returns."""
+        find_bar.find_input.setText("hello")
+        find_bar._search_timer.stop()
+
+        find_bar._highlight_all_matches()
+
+        assert find_bar.match_label.text() == "3 found"
+
+    def test_empty_search_clears_label(self, find_bar, qtbot):
         """Clearing search input should clear match label."""
         find_bar.find_input.setText("hello")
+        qtbot.waitUntil(lambda: "found" in find_bar.match_label.text(), timeout=1000)
         find_bar.find_input.setText("")
-        assert find_bar.match_label.text() == ""
+        qtbot.waitUntil(lambda: find_bar.match_label.text() == "", timeout=1000)
 
 
 # ---------------------------------------------------------------------------
@@ -237,6 +373,53 @@ class TestFindReplaceBarReplace:
 
         assert "Goodbye world" in editor.toPlainText()
 
+    def test_replace_current_case_insensitive(self, find_bar, editor):
+        """Case-insensitive replace should accept a differently-cased selection."""
+        find_bar.find_input.setText("HELLO")
+        find_bar.replace_input.setText("Bye")
+
+        find_bar.find_next()
+        find_bar.replace_current()
+
+        assert editor.toPlainText().startswith("Bye world")
+
+    def test_replace_current_updates_count(self, find_bar, qtbot):
+        """Replacing one match should show the remaining count straight away."""
+        find_bar.find_input.setText("hello")
+        qtbot.waitUntil(lambda: "3 found" in find_bar.match_label.text(), timeout=1000)
+        find_bar.replace_input.setText("Bye")
+
+        find_bar.find_next()
+        find_bar.replace_current()
+
+        assert find_bar.match_label.text() == "2 found"
+
+    def test_replace_current_counts_match_formed_at_boundary(self, find_bar, editor, qtbot):
+        """A replacement that creates a new match with its neighbours is counted."""
+        editor.setPlainText("aab")
+        find_bar.find_input.setText("ab")
+        qtbot.waitUntil(lambda: "1 found" in find_bar.match_label.text(), timeout=1000)
+        find_bar.replace_input.setText("b")
+
+        find_bar.find_next()
+        find_bar.replace_current()
+
+        assert editor.toPlainText() == "ab"
+        assert find_bar.match_label.text() == "1 found"
+
+    def test_replace_current_self_overlapping_query_recounts(self, find_bar, editor, qtbot):
+        """Queries that can overlap themselves are recounted correctly after a replace."""
+        editor.setPlainText("aaaa")
+        find_bar.find_input.setText("aa")
+        qtbot.waitUntil(lambda: "2 found" in find_bar.match_label.text(), timeout=1000)
+        find_bar.replace_input.setText("b")
+
+        find_bar.find_next()
+        find_bar.replace_current()
+
+        assert editor.toPlainText() == "baa"
+        assert find_bar.match_label.text() == "1 found"
+
     def test_replace_all(self, find_bar, editor):
         """Replace all should swap every occurrence."""
         find_bar.find_input.setText("hello")
@@ -262,6 +445,117 @@ class TestFindReplaceBarReplace:
         assert "hello World" in text
         assert "HELLO WORLD" in text
 
+    def test_replace_all_case_sensitive_is_single_undo_step(self, find_bar, editor):
+        """Case-sensitive replace all is one edit that a single undo reverts."""
+        original = editor.toPlainText()
+        find_bar.case_checkbox.setChecked(True)
+        find_bar.find_input.setText("o")
+        find_bar.replace_input.setText("0")
+
+        find_bar.replace_all()
+
+        assert editor.toPlainText() == original.replace("o", "0")
+        assert find_bar.match_label.text() == f"{original.count('o')} replaced"
+        editor.undo()
+        assert editor.toPlainText() == original
+
+    def test_replace_all_emits_text_changed_once(self, find_bar, editor):
+        """Replace all should notify listeners once, not once per match."""
+        emitted = []
+        editor.textChanged.connect(lambda: emitted.append(True))
+        find_bar.find_input.setText("o")
+        find_bar.replace_input.setText("0")
+
+        find_bar.replace_all()
+
+        assert len(emitted) == 1
+        assert editor.updatesEnabled()
+        assert not editor.signalsBlocked()
+
+    @pytest.mark.parametrize("case_sensitive", [False, True])
+    def test_replace_all_reports_undo_available(self, find_bar, editor, case_sensitive):
+        """Undo/redo listeners should hear about the batch despite the blocked signals."""
+        undo, redo = [], []
+        editor.undoAvailable.connect(undo.append)
+        editor.redoAvailable.connect(redo.append)
+        editor.document().clearUndoRedoStacks()
+        find_bar.case_checkbox.setChecked(case_sensitive)
+        find_bar.find_input.setText("hello" if not case_sensitive else "Hello")
+        find_bar.replace_input.setText("bye")
+
+        find_bar.replace_all()
+
+        assert undo[-1] is True
+        assert redo == [] or redo[-1] is False
+
+    def test_replace_all_leaves_caret_after_last_replacement(self, find_bar, editor):
+        """The editor caret should end up just after the last replaced match."""
+        find_bar.find_input.setText("hello")
+        find_bar.replace_input.setText("bye")
+
+        find_bar.replace_all()
+
+        text = editor.toPlainText()
+        assert editor.textCursor().position() == text.rfind("bye") + len("bye")
+
+    def test_replace_all_literal_leaves_caret_after_last_replacement(self, find_bar, editor):
+        """The one-insert case-sensitive path also leaves the caret after the last match."""
+        editor.setPlainText("o\U0001f600o\nno \U0001f600 tail")
+        find_bar.case_checkbox.setChecked(True)
+        find_bar.find_input.setText("o")
+        find_bar.replace_input.setText("0")
+
+        with patch.object(find_bar, "_replace_all_by_find") as by_find:
+            find_bar.replace_all()
+
+        by_find.assert_not_called()
+        tail = " \U0001f600 tail"
+        assert editor.toPlainText() == "0\U0001f6000\nn0" + tail
+        end = editor.document().characterCount() - 1
+        assert editor.textCursor().position() == end - len(tail.encode("utf-16-le")) // 2
+
+    def test_replace_all_sparse_case_sensitive_walks_matches(self, find_bar, editor):
+        """A few case-sensitive matches in a long document skip the full rewrite."""
+        editor.setPlainText("\n".join(["line"] * 40 + ["Hello"]))
+        find_bar.case_checkbox.setChecked(True)
+        find_bar.find_input.setText("Hello")
+        find_bar.replace_input.setText("Bye")
+
+        by_find = find_bar._replace_all_by_find
+        with patch.object(find_bar, "_replace_all_by_find", wraps=by_find) as walk:
+            find_bar.replace_all()
+
+        walk.assert_called_once()
+        assert editor.toPlainText().endswith("line\nBye")
+        assert editor.textCursor().position() == editor.document().characterCount() - 1
+
+    def test_replace_all_notifies_document_listeners_once(self, find_bar, editor):
+        """Case-insensitive replace all should emit one batched document change."""
+        changes = []
+        modified = []
+        document = editor.document()
+        document.contentsChange.connect(lambda *args: changes.append(args))
+        document.modificationChanged.connect(modified.append)
+        find_bar.find_input.setText("hello")
+        find_bar.replace_input.setText("bye")
+
+        find_bar.replace_all()
+
+        text = editor.toPlainText()
+        assert changes == [(0, 0, text.rfind("bye") + len("bye"))]
+        assert modified == [True]
+        assert not document.signalsBlocked()
+
+    def test_replace_all_replacement_contains_search(self, find_bar, editor):
+        """A replacement containing the query must not be matched again."""
+        find_bar.find_input.setText("hello")
+        find_bar.replace_input.setText("hello hello")
+
+        find_bar.replace_all()
+
+        assert editor.toPlainText().count("hello hello") == 3
+        assert find_bar.match_label.text() == "3 replaced"
+
     def test_replace_empty_search_does_nothing(self, find_bar, editor):
         """Replace with empty search should not modify text."""
         original = editor.toPlainText()
@@ -278,3 +572,26 @@ class TestFindReplaceBarReplace:
         bar.replace_input.setText("new")
         bar.replace_current()  # should not raise
         bar.replace_all()  # should not raise
+
+
+# ---------------------------------------------------------------------------
+# Theme
+# ---------------------------------------------------------------------------
+
+
+class TestFindReplaceBarTheme:
+    """Tests for theme application."""
+
+    def test_reapplying_same_theme_skips_set_stylesheet(self, find_bar):
+        """apply_theme with an unchanged theme should not re-set the stylesheet."""
+        with patch.object(find_bar, "setStyleSheet") as set_style:
+            find_bar.apply_theme()
+        set_style.assert_not_called()
+
+    def test_theme_change_updates_stylesheet(self, find_bar):
+        """Switching theme should apply that theme's stylesheet."""
+        current = find_bar._settings.get_current_theme().name
+        other = next(theme for name, theme in THEMES.items() if name != current)
+        with patch.object(find_bar._settings, "get_current_theme", return_value=other):
+            find_bar.apply_theme()
+        assert other.chrome_bg in find_bar.styleSheet()
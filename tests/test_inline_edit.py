@@ -1,5 +1,7 @@
 """Tests for Inline AI Edit (Ctrl+K) feature."""
 
+import pytest
+
 from ui.inline_edit_widget import InlineEditBar
 
 # ---------------------------------------------------------------------------
@@ -33,6 +35,19 @@ class TestInlineEditBarWidget:
         assert not bar.isVisible()
         bar.deleteLater()
 
+    def test_hide_bar_returns_focus_to_parent(self, qapp):
+        """hide_bar() should hand focus back to the parent widget."""
+        from unittest.mock import patch
+
+        from PyQt6.QtWidgets import QWidget
+
+        parent = QWidget()
+        bar = InlineEditBar(parent)
+        with patch.object(parent, "setFocus") as set_focus:
+            bar.hide_bar()
+        set_focus.assert_called_once_with()
+        parent.deleteLater()
+
     def test_edit_requested_signal(self, qapp):
         """Submitting instruction should emit edit_requested with text."""
         bar = InlineEditBar()
@@ -146,6 +161,218 @@ class TestInlineEditBarWidget:
         assert bar.instruction_input.isEnabled()
         bar.deleteLater()
 
+    def test_generating_runs_border_pulse(self, qapp):
+        """set_generating(True) should animate the border without touching the QSS."""
+        from PyQt6.QtCore import QPropertyAnimation
+
+        bar = InlineEditBar()
+        if bar._is_beveled:
+            bar.deleteLater()
+            pytest.skip("beveled themes draw a static border without the pulse")
+        bar.show()
+        qss = bar.styleSheet()
+        bar.set_generating(True)
+
+        assert bar._pulse_anim.state() == QPropertyAnimation.State.Running
+        assert bar.styleSheet() == qss
+        bar.deleteLater()
+
+    def test_pulse_paused_while_hidden(self, qapp):
+        """The pulse should pause while the bar is hidden and resume when shown."""
+        from PyQt6.QtCore import QPropertyAnimation
+
+        bar = InlineEditBar()
+        if bar._is_beveled:
+            bar.deleteLater()
+            pytest.skip("beveled themes draw a static border without the pulse")
+        bar.set_generating(True)
+        assert bar._pulse_anim.state() == QPropertyAnimation.State.Stopped  # not shown yet
+
+        bar.show()
+        assert bar._pulse_anim.state() == QPropertyAnimation.State.Running
+        bar.hide()
+        assert bar._pulse_anim.state() == QPropertyAnimation.State.Paused
+        bar.show()
+        assert bar._pulse_anim.state() == QPropertyAnimation.State.Running
+        bar.deleteLater()
+
+    def test_complete_stops_pulse_with_green_border(self, qapp):
+        """Leaving the generating state should stop the pulse and set a fixed color."""
+        from PyQt6.QtCore import QPropertyAnimation
+        from PyQt6.QtGui import QColor
+
+        from ui.inline_edit_widget import _GREEN
+
+        bar = InlineEditBar()
+        if bar._is_beveled:
+            bar.deleteLater()
+            pytest.skip("beveled themes draw a static border without the pulse")
+        bar.set_generating(True)
+        bar.set_generating(False)
+
+        assert bar._pulse_anim.state() == QPropertyAnimation.State.Stopped
+        assert bar.property("border_color") == QColor(_GREEN)
+        bar.deleteLater()
+
+    def test_frame_path_reused_until_resize(self, qapp):
+        """Pulse repaints should reuse the rounded outline until the bar is resized."""
+        from PyQt6.QtGui import QColor
+
+        bar = InlineEditBar()
+        if bar._is_beveled:
+            bar.deleteLater()
+            pytest.skip("beveled themes draw a static border without the pulse")
+        bar.resize(300, 40)
+        bar.grab()
+        path = bar._frame_path
+        assert path is not None
+        assert path.boundingRect().width() == bar.width() - 1
+
+        bar.border_color = QColor("#123456")
+        bar.grab()
+        assert bar._frame_path is path
+
+        bar.resize(400, 40)
+        bar.grab()
+        assert bar._frame_path.boundingRect().width() == bar.width() - 1 == 399
+        bar.deleteLater()
+
+    def test_unchanged_border_color_skips_repaint(self, qapp):
+        """Re-entering a state with the same border color should not schedule a repaint."""
+        from unittest.mock import patch
+
+        bar = InlineEditBar()
+        bar.show_bar()
+        with patch.object(bar, "update") as update:
+            bar.show_bar()
+        update.assert_not_called()
+        bar.deleteLater()
+
+    def test_state_change_recolors_labels_without_stylesheets(self, qapp):
+        """State changes should recolor the icon/hint via palette, not per-label QSS."""
+        from PyQt6.QtGui import QColor, QPalette
+
+        from ui.inline_edit_widget import _RED
+
+        bar = InlineEditBar()
+        bar.set_error("boom")
+        for label in (bar._icon_label, bar.status_label):
+            assert label.styleSheet() == ""
+            assert label.palette().color(QPalette.ColorRole.WindowText) == QColor(_RED)
+        bar.deleteLater()
+
+    def test_set_status_same_color_keeps_palette(self, qapp):
+        """Repeated status updates in the same color should not touch the palette."""
+        from unittest.mock import patch
+
+        bar = InlineEditBar()
+        bar.set_status("first")
+        with patch.object(bar.status_label, "setPalette") as set_palette:
+            bar.set_status("second")
+        set_palette.assert_not_called()
+        assert bar.status_label.text() == "second"
+        bar.deleteLater()
+
+    def test_key_presses_route_to_signals(self, qapp):
+        """Enter/Escape should emit their signals; other keys should type text."""
+        from PyQt6.QtCore import Qt
+        from PyQt6.QtTest import QTest
+
+        bar = InlineEditBar()
+        line_edit = bar.instruction_input
+        received = []
+        line_edit.enter_pressed.connect(lambda: received.append("enter"))
+        line_edit.escape_pressed.connect(lambda: received.append("escape"))
+
+        QTest.keyClicks(line_edit, "ab")
+        for key in (Qt.Key.Key_Return, Qt.Key.Key_Enter, Qt.Key.Key_Escape):
+            QTest.keyClick(line_edit, key)
+
+        assert line_edit.text() == "ab"
+        assert received == ["enter", "enter", "escape"]
+        bar.deleteLater()
+
+    def test_apply_theme_reuses_settings_manager(self, qapp):
+        """apply_theme() should read the theme through the bar's existing settings."""
+        from unittest.mock import patch
+
+        bar = InlineEditBar()
+        settings = bar._settings
+        with patch("ui.inline_edit_widget.SettingsManager") as manager_cls:
+            bar.apply_theme()
+        manager_cls.assert_not_called()
+        assert bar._settings is settings
+        bar.deleteLater()
+
+    def test_stylesheet_built_once_per_theme(self, qapp):
+        """A second bar on the same theme should reuse the cached stylesheet."""
+        from unittest.mock import patch
+
+        from ui import inline_edit_widget
+
+        first = InlineEditBar()
+        with patch.object(inline_edit_widget, "_build_stylesheet") as build:
+            second = InlineEditBar()
+        build.assert_not_called()
+        assert second.styleSheet() == first.styleSheet()
+        first.deleteLater()
+        second.deleteLater()
+
+    def test_background_color_parsed_once_per_theme(self, qapp):
+        """A second bar on the same theme should reuse the cached background color."""
+        from unittest.mock import patch
+
+        from core.settings import EditorTheme
+
+        first = InlineEditBar()
+        with patch.object(EditorTheme, "_darken") as darken:
+            second = InlineEditBar()
+        darken.assert_not_called()
+        assert second._bg_qcolor == first._bg_qcolor
+        first.deleteLater()
+        second.deleteLater()
+
+    def test_reapplying_same_theme_skips_set_stylesheet(self, qapp):
+        """apply_theme with an unchanged theme should not re-set the stylesheet."""
+        from unittest.mock import patch
+
+        bar = InlineEditBar()
+        with patch.object(bar, "setStyleSheet") as set_style:
+            bar.apply_theme()
+        set_style.assert_not_called()
+        bar.deleteLater()
+
+    def test_theme_change_updates_stylesheet(self, qapp):
+        """Switching theme should apply that theme's stylesheet."""
+        from unittest.mock import patch
+
+        from core.settings import THEMES
+
+        bar = InlineEditBar()
+        current = bar._settings.get_current_theme().name
+        other = next(theme for name, theme in THEMES.items() if name != current)
+        with patch.object(bar._settings, "get_current_theme", return_value=other):
+            bar.apply_theme()
+        assert other.foreground in bar.styleSheet()
+        assert bar._is_beveled == other.is_beveled
+        bar.deleteLater()
+
+    def test_styled_background_only_for_beveled_theme(self, qapp):
+        """QSS should paint the bar background only for the Win95 bevel theme."""
+        from unittest.mock import patch
+
+        from PyQt6.QtCore import Qt
+
+        from core.settings import THEMES
+
+        bar = InlineEditBar()
+        for theme in (THEMES["Win95 Dark"], THEMES["Dark (Default)"]):
+            with patch.object(bar._settings, "get_current_theme", return_value=theme):
+                bar.apply_theme()
+            styled = bar.testAttribute(Qt.WidgetAttribute.WA_StyledBackground)
+            assert styled == theme.is_beveled
+        bar.deleteLater()
+
     def test_set_status(self, qapp):
         """set_status() should update the status label."""
         bar = InlineEditBar()
@@ -254,6 +481,206 @@ class TestEditorInlineEdit:
 # ---------------------------------------------------------------------------
 
 
+# ---------------------------------------------------------------------------
+# InlineEditController streaming tests
+# ---------------------------------------------------------------------------
+
+
+class TestInlineEditControllerStreaming:
+    """Test token collection and selection replacement in InlineEditController."""
+
+    def _make_controller(self, editor):
+        from PyQt6.QtWidgets import QMainWindow
+
+        from ui.inline_edit_controller import InlineEditController
+        from ui.side_panel import LayoutMode
+
+        window = QMainWindow()
+        controller = InlineEditController(
+            window, lambda: editor, lambda: "llama3.1", lambda: LayoutMode.CODING
+        )
+        return window, controller
+
+    def test_tokens_replace_selection_on_finish(self, qapp):
+        """Streamed tokens should be joined and replace the saved selection."""
+        from ui.editor_tab import EditorTab
+
+        editor = EditorTab()
+        editor.setPlainText("a = 1\nb = 2")
+        window, controller = self._make_controller(editor)
+        controller._selection_start = 0
+        controller._selection_end = 5
+        controller._active = True
+
+        for token in ["```python\n", "a = ", "42", "\n```"]:
+            controller._on_token(token)
+        controller._on_finished()
+
+        assert editor.toPlainText() == "a = 42\nb = 2"
+        assert controller._buffer == "```python\na = 42\n```"
+        assert controller._buffer_parts == []
+        assert not controller.is_active
+        editor.deleteLater()
+        window.deleteLater()
+
+    def test_tokens_stream_into_editor_before_finish(self, qapp, qtbot):
+        """Tokens should appear in the editor while generation is still running."""
+        from ui.editor_tab import EditorTab
+
+        editor = EditorTab()
+        editor.setPlainText("a = 1\nb = 2")
+        window, controller = self._make_controller(editor)
+        controller._selection_start = 0
+        controller._selection_end = 5
+        controller._active = True
+
+        controller._on_token("a = ")
+        controller._on_token("4")
+        qtbot.waitUntil(lambda: editor.toPlainText() == "a = 4\nb = 2", timeout=1000)
+
+        controller._on_token("2")
+        controller._on_finished()
+        assert editor.toPlainText() == "a = 42\nb = 2"
+
+        # The whole streamed edit is a single undo step
+        editor.document().undo()
+        assert editor.toPlainText() == "a = 1\nb = 2"
+        editor.deleteLater()
+        window.deleteLater()
+
+    def test_token_burst_coalesced_into_one_edit(self, qapp, qtbot):
+        """Tokens arriving within one frame should produce a single document edit."""
+        from ui.editor_tab import EditorTab
+
+        editor = EditorTab()
+        editor.setPlainText("a = 1")
+        window, controller = self._make_controller(editor)
+        controller._selection_start = 0
+        controller._selection_end = 5
+        controller._active = True
+        edits = []
+        editor.document().contentsChange.connect(lambda *args: edits.append(args))
+
+        for token in ["x", " ", "=", " ", "2"]:
+            controller._on_token(token)
+        assert edits == []  # nothing written until the timer fires
+        qtbot.waitUntil(lambda: editor.toPlainText() == "x = 2", timeout=1000)
+
+        assert len(edits) == 1
+        editor.deleteLater()
+        window.deleteLater()
+
+    def test_manager_signals_delivered_through_event_loop(self, qapp, qtbot):
+        """Manager signals are queued: handled on the next event loop pass, in order."""
+        from ui.editor_tab import EditorTab
+
+        editor = EditorTab()
+        editor.setPlainText("a = 1")
+        window, controller = self._make_controller(editor)
+        controller._selection_start = 0
+        controller._selection_end = 5
+        controller._active = True
+
+        controller._manager.token_received.emit("b = 2")
+        controller._manager.generation_finished.emit()
+        assert controller._buffer_parts == []  # not delivered yet
+
+        qtbot.waitUntil(lambda: not controller.is_active, timeout=1000)
+        assert editor.toPlainText() == "b = 2"
+        editor.deleteLater()
+        window.deleteLater()
+
+    def test_stop_reverts_partial_stream(self, qapp):
+        """Stopping mid-stream should restore the original selection text."""
+        from ui.editor_tab import EditorTab
+
+        editor = EditorTab()
+        editor.setPlainText("a = 1\nb = 2")
+        window, controller = self._make_controller(editor)
+        controller._selection_start = 0
+        controller._selection_end = 5
+        controller._active = True
+
+        controller._on_token("partial")
+        controller._flush_stream()
+        assert editor.toPlainText() == "partial\nb = 2"
+
+        controller.stop()
+        assert editor.toPlainText() == "a = 1\nb = 2"
+        editor.deleteLater()
+        window.deleteLater()
+
+    def test_error_discards_partial_tokens(self, qapp):
+        """An error should drop tokens collected so far."""
+        from ui.editor_tab import EditorTab
+
+        editor = EditorTab()
+        editor.setPlainText("a = 1")
+        window, controller = self._make_controller(editor)
+        controller._selection_start = 0
+        controller._selection_end = 5
+        controller._active = True
+        controller._on_token("partial")
+        controller._flush_stream()
+        controller._on_error("boom")
+
+        assert controller._buffer_parts == []
+        assert editor.toPlainText() == "a = 1"
+        editor.deleteLater()
+        window.deleteLater()
+
+    def test_revert_keeps_user_edits_made_during_stream(self, qapp):
+        """Reverting should remove only the preview, not edits typed meanwhile."""
+        from PyQt6.QtGui import QTextCursor
+
+        from ui.editor_tab import EditorTab
+
+        editor = EditorTab()
+        editor.setPlainText("a = 1\nb = 2")
+        window, controller = self._make_controller(editor)
+        controller._selection_start = 0
+        controller._selection_end = 5
+        controller._active = True
+
+        controller._on_token("x = ")
+        controller._flush_stream()
+        user = QTextCursor(editor.document())
+        user.movePosition(QTextCursor.MoveOperation.End)
+        user.insertText("  # note")
+        controller._on_token("9")
+        controller._flush_stream()
+        assert editor.toPlainText() == "x = 9\nb = 2  # note"
+
+        controller.stop()
+        assert editor.toPlainText() == "a = 1\nb = 2  # note"
+        editor.deleteLater()
+        window.deleteLater()
+
+    def test_finish_without_editor_resets_stream_state(self, qapp):
+        """Finishing after the editor went away should still end the stream."""
+        from ui.editor_tab import EditorTab
+
+        editor = EditorTab()
+        editor.setPlainText("a = 1")
+        current = [editor]
+        window, controller = self._make_controller(editor)
+        controller._get_editor = lambda: current[0]
+        controller._selection_start = 0
+        controller._selection_end = 5
+        controller._active = True
+        controller._on_token("b = 2")
+        controller._flush_stream()
+
+        current[0] = None
+        controller._on_finished()
+
+        assert not controller.is_active
+        assert controller._stream_cursor is None
+        assert controller._stream_start is None
+        editor.deleteLater()
+        window.deleteLater()
+
+
 class TestStripCodeFences:
     """Test markdown code fence stripping from AI responses."""
 
@@ -302,3 +729,16 @@ class TestStripCodeFences:
         code = "```python\nprint(`x`)\n```"
         result = InlineEditController._strip_code_fences(code)
         assert "print(`x`)" in result
+
+    def test_single_line_fence_only(self):
+        """A lone opening fence with no body should return empty."""
+        from ui.inline_edit_controller import InlineEditController
+
+        assert InlineEditController._strip_code_fences("```python") == ""
+
+    def test_indented_closing_fence(self):
+        """A closing fence indented inside the response should still be removed."""
+        from ui.inline_edit_controller import InlineEditController
+
+        code = "```\n    x = 1\n    ```"
+        assert InlineEditController._strip_code_fences(code) == "    x = 1"
@@ -17,6 +17,22 @@ class TestImports:
 
         assert MainWindow is not None
 
+    def test_main_window_defers_panel_imports(self):
+        """Importing MainWindow should not load the file browser or settings dialog."""
+        import subprocess
+        import sys
+        from pathlib import Path
+
+        src = Path(__file__).parent.parent / "src"
+        code = (
+            "import sys; import ui.main_window; "
+            "print('ui.file_browser' in sys.modules, 'ui.settings_dialog' in sys.modules)"
+        )
+        result = subprocess.run(
+            [sys.executable, "-c", code], cwd=src, capture_output=True, text=True, check=True
+        )
+        assert result.stdout.split() == ["False", "False"]
+
     def test_import_activity_bar(self):
         """Import ActivityBar."""
         from ui.activity_bar import ActivityBar
@@ -64,6 +80,353 @@ class TestInstantiation:
         assert window.activity_bar is not None
         assert window.file_browser is not None
 
+    def test_file_browser_built_on_first_use(self, qtbot):
+        """The file browser should only be created when the Files panel is opened."""
+        from ui.main_window import MainWindow
+
+        window = MainWindow()
+        qtbot.addWidget(window)
+        assert window._file_browser is None
+        window._theme_engine.apply_child_themes()
+        assert window._file_browser is None
+
+        window._on_panel_selected("files")
+
+        assert window._file_browser is not None
+        assert window.panel_content.currentWidget() is window.file_browser
+        assert window.panel_content.count() == 2
+
+    def test_new_tab_with_code_sets_language(self, qtbot):
+        """Code sent to a new tab should pick the editor language from the block tag."""
+        from syntax.highlighter import Language
+        from ui.main_window import MainWindow
+
+        window = MainWindow()
+        qtbot.addWidget(window)
+
+        window._new_tab_with_code("x = 1", "Py")
+        assert window.current_editor().language == Language.PYTHON
+
+        window._new_tab_with_code("plain", "unknown")
+        assert window.current_editor().toPlainText() == "plain"
+
+    def test_tab_fade_off_by_default(self, qtbot):
+        """Switching tabs should not attach an opacity effect unless the fade is enabled."""
+        from ui.main_window import MainWindow
+
+        window = MainWindow()
+        qtbot.addWidget(window)
+        window.settings_manager.settings.remove("tab_fade_enabled")
+        window.new_tab()
+        window.tab_widget.setCurrentIndex(0)
+
+        assert window.settings_manager.get_tab_fade_enabled() is False
+        assert window.current_editor().graphicsEffect() is None
+
+    def test_tab_fade_effect_removed_after_animation(self, qtbot):
+        """With the fade enabled, the opacity effect is detached once the fade ends."""
+        from ui.main_window import MainWindow
+
+        window = MainWindow()
+        qtbot.addWidget(window)
+        window.settings_manager.set_tab_fade_enabled(True)
+        try:
+            window.new_tab()
+            editor = window.current_editor()
+
+            assert editor.graphicsEffect() is not None
+            qtbot.waitUntil(lambda: editor.graphicsEffect() is None)
+        finally:
+            window.settings_manager.settings.remove("tab_fade_enabled")
+
+    def test_app_icon_loaded_once(self, qtbot):
+        """Windows should share one app icon instead of decoding the .ico each time."""
+        from unittest.mock import patch
+
+        from ui.main_window import MainWindow
+        from ui.title_bar import TitleBarController
+
+        first = MainWindow()
+        qtbot.addWidget(first)
+        with patch("ui.title_bar.QIcon") as icon_cls:
+            second = MainWindow()
+            qtbot.addWidget(second)
+
+        icon_cls.assert_not_called()
+        assert TitleBarController._get_app_icon() is TitleBarController._get_app_icon()
+
+    def test_language_menu_lists_every_language(self, qtbot):
+        """The View > Language menu should hold one grouped action per language, in order."""
+        from syntax.highlighter import Language
+        from ui.main_window import MainWindow
+
+        window = MainWindow()
+        qtbot.addWidget(window)
+
+        actions = window.language_menu.actions()
+        assert [a.data() for a in actions] == list(Language)
+        assert all(a.actionGroup() is window.language_actions for a in actions)
+
+    def test_modified_marker_tracks_each_tab(self, qtbot):
+        """Editing a tab should mark only that tab's title, and saving should clear it."""
+        from ui.main_window import MainWindow
+
+        window = MainWindow()
+        qtbot.addWidget(window)
+        first = window.current_editor()
+        second = window.new_tab()
+        tabs = window.tab_widget
+
+        first.insertPlainText("edit")
+        assert tabs.tabText(tabs.indexOf(first)).endswith("*")
+        assert not tabs.tabText(tabs.indexOf(second)).endswith("*")
+
+        first.document().setModified(False)
+        assert not tabs.tabText(tabs.indexOf(first)).endswith("*")
+
+        # The slot is bound to its editor, so it also works when called directly
+        window._on_document_modified(second, True)
+        assert tabs.tabText(tabs.indexOf(second)).endswith("*")
+
+    def test_formatting_round_trip(self, qtbot):
+        """Formatting edits are single undo steps; Clear Formatting strips markup."""
+        from ui.main_window import MainWindow
+
+        window = MainWindow()
+        qtbot.addWidget(window)
+        editor = window.current_editor()
+        editor.setPlainText("word")
+        editor.selectAll()
+
+        window._toggle_bold()
+        assert editor.toPlainText() == "**word**"
+        editor.undo()
+        assert editor.toPlainText() == "word"
+
+        editor.setPlainText("**bold** and `code`")
+        editor.selectAll()
+        window._clear_formatting()
+        assert editor.toPlainText() == "bold and code"
+
+        editor.setPlainText("")
+        window._toggle_italic()
+        assert editor.toPlainText() == "**"
+        assert editor.textCursor().position() == 1
+        editor.undo()
+        assert editor.toPlainText() == ""
+
+        # Avoid the unsaved-changes prompt when the window closes
+        editor.document().setModified(False)
+
+    def test_link_and_heading_insertion(self, qtbot):
+        """Links select their placeholder; headings prefix the current line."""
+        from ui.main_window import MainWindow
+
+        window = MainWindow()
+        qtbot.addWidget(window)
+        editor = window.current_editor()
+
+        window._insert_link()
+        assert editor.toPlainText() == "[text](url)"
+        assert editor.textCursor().selectedText() == "text"
+
+        editor.setPlainText("page")
+        editor.selectAll()
+        window._insert_link()
+        assert editor.toPlainText() == "[page](url)"
+
+        editor.setPlainText("Title")
+        window._insert_heading(2)
+        assert editor.toPlainText() == "## Title"
+
+        editor.document().setModified(False)
+
+    def test_file_dialogs_skip_icon_and_symlink_lookups(self, qtbot):
+        """Open and Save As dialogs should pass the fast file dialog options."""
+        from unittest.mock import patch
+
+        from PyQt6.QtWidgets import QFileDialog
+
+        from ui.main_window import MainWindow
+
+        window = MainWindow()
+        qtbot.addWidget(window)
+        expected = (
+            QFileDialog.Option.DontUseCustomDirectoryIcons | QFileDialog.Option.DontResolveSymlinks
+        )
+
+        with patch.object(QFileDialog, "getOpenFileName", return_value=("", "")) as dialog:
+            window.open_file()
+        assert dialog.call_args.kwargs["options"] == expected
+
+        with patch.object(QFileDialog, "getSaveFileName", return_value=("", "")) as dialog:
+            window.save_file_as()
+        assert dialog.call_args.kwargs["options"] == expected
+        assert dialog.call_args.args[3].startswith("All Files (*);;Text Files (*.txt)")
+
+    def test_settings_apply_restyles_only_what_changed(self, qtbot):
+        """Applying settings should skip restyling when theme and font are unchanged."""
+        from unittest.mock import patch
+
+        from core.settings import THEMES
+        from ui.main_window import MainWindow
+
+        window = MainWindow()
+        qtbot.addWidget(window)
+        engine = window._theme_engine
+        sm = window.settings_manager
+
+        try:
+            with (
+                patch.object(engine, "apply_child_themes") as child_themes,
+                patch.object(engine, "apply_editor_themes") as editor_themes,
+            ):
+                window._apply_settings_to_editors()
+                child_themes.assert_not_called()
+                editor_themes.assert_not_called()
+
+                sm.set_font_size(sm.get_font_size() + 1)
+                window._apply_settings_to_editors()
+                child_themes.assert_not_called()
+                editor_themes.assert_called_once()
+
+                sm.set_current_theme(next(n for n in THEMES if n != sm.get_current_theme_name()))
+                window._apply_settings_to_editors()
+                child_themes.assert_called_once()
+        finally:
+            sm.settings.remove("theme")
+            sm.settings.remove("font_size")
+
+    def test_editor_list_follows_open_tabs(self, qtbot):
+        """The cached editor list should gain new tabs and drop closed ones."""
+        from unittest.mock import patch
+
+        from ui.main_window import MainWindow
+
+        window = MainWindow()
+        qtbot.addWidget(window)
+        first = window.current_editor()
+        second = window.new_tab()
+        assert window._editor_tabs == [first, second]
+
+        window.close_tab(window.tab_widget.indexOf(first))
+        assert window._editor_tabs == [second]
+
+        with patch.object(second, "apply_theme") as apply_theme:
+            window._theme_engine.apply_editor_themes()
+        apply_theme.assert_called_once()
+
+    def test_closed_tab_signals_disconnected(self, qtbot):
+        """Closing a tab should unwire its editor before it is deleted."""
+        from unittest.mock import patch
+
+        from ui.main_window import MainWindow
+
+        window = MainWindow()
+        qtbot.addWidget(window)
+        editor = window.new_tab()
+
+        window.close_tab(window.tab_widget.indexOf(editor))
+
+        with patch.object(window.tab_widget, "indexOf") as index_of:
+            editor.document().modificationChanged.emit(True)
+        index_of.assert_not_called()
+        assert editor.receivers(editor.inline_edit_requested) == 0
+        assert editor.receivers(editor.completion_requested) == 0
+
+    def test_recent_menu_reuses_actions(self, qtbot, tmp_path):
+        """Recent file changes should relabel the existing menu entries, not rebuild them."""
+        from ui.main_window import MainWindow
+
+        window = MainWindow()
+        qtbot.addWidget(window)
+        window.recent_files.clear()
+        actions_before = window.recent_menu.actions()
+
+        first = tmp_path / "first.txt"
+        second = tmp_path / "second.txt"
+        first.write_text("1")
+        second.write_text("2")
+        window.recent_files.add_file(str(first))
+        window.recent_files.add_file(str(second))
+        window.recent_menu.aboutToShow.emit()
+
+        assert window.recent_menu.actions() == actions_before
+        visible = [a for a in window._recent_actions if a.isVisible()]
+        assert [a.data() for a in visible] == [str(second.resolve()), str(first.resolve())]
+        assert visible[0].text().startswith("&1  second.txt")
+        assert window._clear_recent_action.isVisible()
+        assert not window._no_recent_action.isVisible()
+
+        window.recent_files.clear()
+        window.recent_menu.aboutToShow.emit()
+        assert not any(a.isVisible() for a in window._recent_actions)
+        assert window._no_recent_action.isVisible()
+
+    def test_recent_menu_refreshed_only_when_opened(self, qtbot, tmp_path):
+        """List changes should only mark the menu; opening it applies them once."""
+        from unittest.mock import patch
+
+        from ui.main_window import MainWindow
+
+        window = MainWindow()
+        qtbot.addWidget(window)
+        path = tmp_path / "note.txt"
+        path.write_text("x")
+
+        with patch.object(window.recent_files, "get_files", return_value=[]) as get_files:
+            window.recent_files.add_file(str(path))
+            window.recent_files.add_file(str(path))
+            get_files.assert_not_called()
+
+            window.recent_menu.aboutToShow.emit()
+            window.recent_menu.aboutToShow.emit()
+            get_files.assert_called_once()
+
+    def test_missing_recent_file_message_names_the_file(self, qtbot, tmp_path):
+        """The File Not Found message should fill its placeholder with the path."""
+        from unittest.mock import patch
+
+        from PyQt6.QtWidgets import QMessageBox
+
+        from ui.main_window import MainWindow
+
+        window = MainWindow()
+        qtbot.addWidget(window)
+        window.recent_files.clear()
+        path = tmp_path / "gone.txt"
+        path.write_text("x")
+        window.recent_files.add_file(str(path))
+        window.recent_menu.aboutToShow.emit()
+        path.unlink()
+
+        with patch.object(QMessageBox, "warning") as warning:
+            window._recent_actions[0].trigger()
+
+        message = warning.call_args.args[2]
+        assert "%1" not in message
+        assert message.endswith(str(path.resolve()))
+
+    def test_new_tab_button_follows_last_tab(self, qtbot):
+        """The + button should move after the last tab when tabs are added or closed."""
+        from ui.main_window import MainWindow
+
+        window = MainWindow()
+        qtbot.addWidget(window)
+        window.show()
+        bar = window.custom_tab_bar
+
+        def button_after_last_tab():
+            return window.new_tab_btn.x() == bar.tabRect(bar.count() - 1).right() + 4
+
+        with qtbot.waitSignal(bar.tabs_changed):
+            window.new_tab()
+        qtbot.waitUntil(button_after_last_tab)
+
+        with qtbot.waitSignal(bar.tabs_changed):
+            window.close_tab(bar.count() - 1)
+        qtbot.waitUntil(button_after_last_tab)
+
     def test_activity_bar_creates(self, qtbot):
         """ActivityBar instantiates and has expected buttons."""
         from ui.activity_bar import ActivityBar
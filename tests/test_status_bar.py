@@ -0,0 +1,187 @@
+# =============================================================================
+# tests/test_status_bar.py — Tests for StatusBarManager
+# =============================================================================
+
+from unittest.mock import patch
+
+from PyQt6.QtWidgets import QMainWindow
+
+from ui.status_bar_manager import StatusBarManager
+
+
+def _make_manager(editor):
+    window = QMainWindow()
+    manager = StatusBarManager(window, lambda: editor)
+    manager.setup()
+    return window, manager
+
+
+class TestStatusBarManager:
+    """Tests for status bar indicator updates."""
+
+    def test_character_count(self, create_editor_tab, qtbot):
+        """The character count should match the document's plain text length."""
+        tab = create_editor_tab(content="ab\ncd\né")
+        qtbot.addWidget(tab)
+        window, manager = _make_manager(tab)
+
+        manager.update()
+
+        assert manager.chars_label.text() == f"{len(tab.toPlainText())} characters"
+        window.deleteLater()
+
+    def test_non_bmp_character_counts_utf16_units(self, create_editor_tab, qtbot):
+        """A character outside the BMP counts as two UTF-16 units, like cursor positions."""
+        tab = create_editor_tab(content="a\U0001f600")
+        qtbot.addWidget(tab)
+        window, manager = _make_manager(tab)
+
+        manager.update()
+
+        assert manager.chars_label.text() == "3 characters"
+        tab.moveCursor(tab.textCursor().MoveOperation.End)
+        assert tab.textCursor().position() == 3
+        window.deleteLater()
+
+    def test_single_character(self, create_editor_tab, qtbot):
+        """A one-character document should use the singular label."""
+        tab = create_editor_tab(content="x")
+        qtbot.addWidget(tab)
+        window, manager = _make_manager(tab)
+
+        manager.update()
+
+        assert manager.chars_label.text() == "1 character"
+        window.deleteLater()
+
+    def test_line_ending_label(self, create_editor_tab, qtbot):
+        """Multi-line documents show LF; single-line documents keep the CRLF default."""
+        tab = create_editor_tab(content="one line")
+        qtbot.addWidget(tab)
+        window, manager = _make_manager(tab)
+
+        manager.update()
+        assert manager.line_ending_label.text() == "CRLF"
+
+        tab.setPlainText("first\nsecond")
+        manager.update()
+        assert manager.line_ending_label.text() == "LF"
+        window.deleteLater()
+
+    def test_update_does_not_copy_document_text(self, create_editor_tab, qtbot):
+        """Keystroke updates should read document metrics, not the full plain text."""
+        tab = create_editor_tab(content="some text\nmore text")
+        qtbot.addWidget(tab)
+        window, manager = _make_manager(tab)
+
+        with patch.object(tab, "toPlainText") as to_plain_text:
+            manager.update()
+
+        to_plain_text.assert_not_called()
+        window.deleteLater()
+
+    def test_connect_editor_moves_signals_to_new_editor(self, create_editor_tab, qtbot):
+        """Wiring a new editor should disconnect the previous one."""
+        first = create_editor_tab(content="first")
+        second = create_editor_tab(content="second")
+        qtbot.addWidget(first)
+        qtbot.addWidget(second)
+        current = first
+        window = QMainWindow()
+        manager = StatusBarManager(window, lambda: current)
+        manager.setup()
+
+        manager.connect_editor(first)
+        current = second
+        manager.connect_editor(second)
+
+        with patch.object(manager, "update") as update:
+            first.setPlainText("changed")
+            update.assert_not_called()
+        assert first.receivers(first.textChanged) == 0
+        assert second.receivers(second.textChanged) == 1
+        window.deleteLater()
+
+    def test_connect_same_editor_is_noop(self, create_editor_tab, qtbot):
+        """Re-wiring the already wired editor should skip the update."""
+        tab = create_editor_tab(content="text")
+        qtbot.addWidget(tab)
+        window, manager = _make_manager(tab)
+        manager.connect_editor(tab)
+
+        with patch.object(manager, "update") as update:
+            manager.connect_editor(tab)
+
+        update.assert_not_called()
+        assert tab.receivers(tab.textChanged) == 1
+        window.deleteLater()
+
+    def test_deleted_editor_is_forgotten(self, create_editor_tab, qtbot):
+        """Wiring a new editor after the previous one was deleted should not raise."""
+        from PyQt6.QtCore import QCoreApplication, QEvent
+
+        from ui.editor_tab import EditorTab
+
+        first = EditorTab()
+        second = create_editor_tab(content="second")
+        qtbot.addWidget(second)
+        window, manager = _make_manager(second)
+        manager.connect_editor(first)
+
+        first.deleteLater()
+        QCoreApplication.sendPostedEvents(None, QEvent.Type.DeferredDelete)
+
+        manager.connect_editor(second)
+        assert manager._wired_editor is second
+        window.deleteLater()
+
+    def test_cursor_move_only_updates_position(self, create_editor_tab, qtbot):
+        """Moving the cursor should refresh the position without recounting the text."""
+        from PyQt6.QtGui import QTextCursor
+
+        tab = create_editor_tab(content="ab\ncd")
+        qtbot.addWidget(tab)
+        window, manager = _make_manager(tab)
+        manager.connect_editor(tab)
+
+        with patch.object(manager, "_show_text_stats") as text_stats:
+            tab.moveCursor(QTextCursor.MoveOperation.End)
+
+        text_stats.assert_not_called()
+        assert manager.position_label.text() == "Ln 2, Col 3"
+        window.deleteLater()
+
+    def test_edit_updates_counts(self, create_editor_tab, qtbot):
+        """Typing should refresh the character count through the editor signals."""
+        tab = create_editor_tab(content="ab")
+        qtbot.addWidget(tab)
+        window, manager = _make_manager(tab)
+        manager.connect_editor(tab)
+
+        tab.insertPlainText("\ncd")
+
+        assert manager.chars_label.text() == "5 characters"
+        assert manager.line_ending_label.text() == "LF"
+        window.deleteLater()
+
+    def test_update_language_checks_matching_action(self, create_editor_tab, qtbot):
+        """The language indicator should check the menu action for that language."""
+        from PyQt6.QtGui import QAction, QActionGroup
+
+        from syntax.highlighter import Language
+
+        tab = create_editor_tab()
+        qtbot.addWidget(tab)
+        window, manager = _make_manager(tab)
+        group = QActionGroup(window)
+        for language in Language:
+            action = QAction(language.name, group)
+            action.setCheckable(True)
+            action.setData(language)
+        manager.set_language_actions(group)
+
+        manager.update_language(Language.PYTHON)
+
+        assert group.checkedAction().data() == Language.PYTHON
+        assert manager.language_label.text() == "Python"
+        window.deleteLater()
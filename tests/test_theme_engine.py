@@ -2,7 +2,7 @@
 # tests/test_theme_engine.py — Tests for ThemeEngine and hex_to_rgba
 # =============================================================================
 
-from unittest.mock import MagicMock
+from unittest.mock import MagicMock, patch
 
 from core.settings import EditorTheme
 from ui.theme_engine import ThemeEngine, hex_to_rgba
@@ -37,6 +37,16 @@ class TestHexToRgba:
     def test_lowercase_hex(self):
         assert hex_to_rgba("#aabbcc", 0.5) == "rgba(170,187,204,0.5)"
 
+    def test_repeat_lookup_hits_cache(self):
+        """A repeated (color, alpha) pair should be served from the cache."""
+        hex_to_rgba.cache_clear()
+        hex_to_rgba("#123456", 0.3)
+        assert hex_to_rgba.cache_info().hits == 0
+
+        assert hex_to_rgba("#123456", 0.3) == "rgba(18,52,86,0.3)"
+        assert hex_to_rgba.cache_info().hits == 1
+        assert hex_to_rgba.cache_info().misses == 1
+
 
 # ---------------------------------------------------------------------------
 # ThemeEngine — stylesheet application tests
@@ -66,6 +76,8 @@ def _make_theme(*, beveled: bool = False) -> EditorTheme:
     )
     if beveled:
         kwargs.update(
+            # Stylesheets are cached per theme name, so variants need their own
+            name="test-win95",
             style_variant="win95",
             bevel_light="#808080",
             bevel_dark="#404040",
@@ -114,6 +126,46 @@ class TestThemeEngine:
         qss = window.setStyleSheet.call_args[0][0]
         assert "border-radius: 6px" in qss
 
+    def test_reapplying_same_theme_skips_set_stylesheet(self, qapp):
+        """Re-applying an unchanged theme should not re-set the main stylesheet."""
+        window = MagicMock()
+        settings = MagicMock()
+        settings.get_current_theme.return_value = _make_theme()
+
+        engine = ThemeEngine(window, settings)
+        engine.apply_theme()
+        engine.apply_theme()
+
+        window.setStyleSheet.assert_called_once()
+
+    def test_main_qss_cached_across_engines(self, qapp):
+        """A second engine on an equal theme should reuse the built stylesheet."""
+        first = MagicMock()
+        second = MagicMock()
+        settings = MagicMock()
+        settings.get_current_theme.return_value = _make_theme()
+
+        ThemeEngine(first, settings).apply_theme()
+        with patch("ui.theme_engine._build_main_qss") as build:
+            ThemeEngine(second, settings).apply_theme()
+
+        build.assert_not_called()
+        assert second.setStyleSheet.call_args == first.setStyleSheet.call_args
+
+    def test_theme_change_reapplies_stylesheet(self, qapp):
+        """Switching to a different theme should set its stylesheet."""
+        window = MagicMock()
+        settings = MagicMock()
+        settings.get_current_theme.return_value = _make_theme()
+
+        engine = ThemeEngine(window, settings)
+        engine.apply_theme()
+        settings.get_current_theme.return_value = _make_theme(beveled=True)
+        engine.apply_theme()
+
+        assert window.setStyleSheet.call_count == 2
+        assert "border-top: 2px solid" in window.setStyleSheet.call_args[0][0]
+
     def test_apply_child_themes_propagates(self, qapp):
         """apply_child_themes should call apply_theme on child widgets."""
         theme = _make_theme()
@@ -126,7 +178,7 @@ class TestThemeEngine:
         engine.apply_child_themes()
 
         window.side_panel.apply_theme.assert_called_once()
-        window.file_browser.apply_theme.assert_called_once()
+        window._file_browser.apply_theme.assert_called_once()
         window.activity_bar.apply_theme.assert_called_once()
         window.find_bar.apply_theme.assert_called_once()
 
@@ -175,27 +227,77 @@ class TestThemeEngine:
         window._min_btn.setStyleSheet.assert_called_once()
         window._close_btn.setStyleSheet.assert_called_once()
 
-    def test_update_new_tab_button_modern(self, qapp):
-        """New tab button should get modern styling."""
+    def test_new_tab_button_modern(self, qapp):
+        """Main QSS should give the new tab button modern styling."""
         window = MagicMock()
         settings = MagicMock()
         settings.get_current_theme.return_value = _make_theme(beveled=False)
 
         engine = ThemeEngine(window, settings)
-        engine.update_new_tab_button_style()
+        engine.apply_theme()
 
-        qss = window.new_tab_btn.setStyleSheet.call_args[0][0]
-        assert "border-radius: 6px" in qss
-        assert "transparent" in qss
+        qss = window.setStyleSheet.call_args[0][0]
+        rule = qss[qss.index("QToolButton#newTabBtn {") :].split("}", 1)[0]
+        assert "border-radius: 6px" in rule
+        assert "transparent" in rule
 
-    def test_update_new_tab_button_beveled(self, qapp):
-        """New tab button should get beveled styling."""
+    def test_new_tab_button_beveled(self, qapp):
+        """Main QSS should give the new tab button beveled styling."""
         window = MagicMock()
         settings = MagicMock()
+        window.tab_widget.count.return_value = 0
         settings.get_current_theme.return_value = _make_theme(beveled=True)
 
         engine = ThemeEngine(window, settings)
-        engine.update_new_tab_button_style()
+        engine.apply_theme()
+        engine.apply_child_themes()
 
-        qss = window.new_tab_btn.setStyleSheet.call_args[0][0]
-        assert "border-top: 2px solid" in qss
+        qss = window.setStyleSheet.call_args[0][0]
+        rule = qss[qss.index("QToolButton#newTabBtn {") :].split("}", 1)[0]
+        assert "border-top: 2px solid" in rule
+        window.new_tab_btn.setStyleSheet.assert_not_called()
+
+
+# ---------------------------------------------------------------------------
+# SettingsManager current theme lookup
+# ---------------------------------------------------------------------------
+
+
+class TestCurrentTheme:
+    """Tests for the cached current theme lookup."""
+
+    def test_theme_name_read_once(self, qapp):
+        """Repeated lookups should not hit QSettings again."""
+        from core.settings import SettingsManager
+
+        sm = SettingsManager()
+        sm.get_current_theme()
+        with patch.object(sm.settings, "value") as value:
+            sm.get_current_theme()
+            SettingsManager().get_current_theme()
+
+        value.assert_not_called()
+
+    def test_set_theme_visible_to_other_instances(self, qapp):
+        """A theme set through one manager should be seen by every other manager."""
+        from core.settings import THEMES, SettingsManager
+
+        other = SettingsManager()
+        other.get_current_theme()
+        name = next(n for n in THEMES if n != other.get_current_theme_name())
+
+        SettingsManager().set_current_theme(name)
+        try:
+            assert other.get_current_theme() is THEMES[name]
+        finally:
+            other.settings.remove("theme")
+
+    def test_unknown_theme_ignored(self, qapp):
+        """Setting an unknown theme name should leave the current theme unchanged."""
+        from core.settings import SettingsManager
+
+        sm = SettingsManager()
+        before = sm.get_current_theme_name()
+        sm.set_current_theme("No Such Theme")
+
+        assert sm.get_current_theme_name() == before